@@ -44,6 +44,16 @@ Z_STOP_LOSS_LONG = -3.0
 # Z-score threshold for short position stop-loss.
 Z_STOP_LOSS_SHORT = 3.0
 
+# Minimum relative price move (vs. the last evaluated price) required to
+# recompute a position's z-score; smaller moves reuse the cached value.
+Z_RECOMPUTE_PRICE_EPS = 1e-4
+
+# Compute full-series rolling z-scores in float32 instead of float64.
+# Halves the bytes streamed per pass; float32's ~7 significant digits are
+# ample for thresholds at |z| < ~4, but leave False if trading instruments
+# with extreme price magnitudes.
+Z_SCORE_FP32 = False
+
 
 # --- Stock Universe ---
 
@@ -77,6 +87,11 @@ POSITIONS_FILE = os.path.join(CURRENT_RUN_DIR, 'positions.json')
 # Path to the CSV file for completed trades (keep at top-level logs directory for summary, or move to run dir if desired)
 TRADES_CSV_FILE = os.path.join(LOGS_DIR, 'trades.csv')
 
+# Path to the on-disk cache of historical daily bars, shared across runs.
+# All but the most recent day's bars are immutable, so each session only
+# downloads bars newer than this cache instead of the full z-score window.
+BARS_CACHE_FILE = os.path.join(LOGS_DIR, 'bars_cache.pkl')
+
 # Path to the JSON file for tracking all pending orders (entry and exit) across bot runs
 # This file maintains the current state of pending orders across sessions.
 PENDING_ORDERS_FILE = os.path.join(LOGS_DIR, 'pending_orders.json')
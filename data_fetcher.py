@@ -9,6 +9,13 @@ import pandas_market_calendars as mcal
 
 load_dotenv()
 
+# Read once at import; the keys and paper/live endpoint are constant for
+# the life of the process, so repeat client initializations skip the
+# environ probes.
+_ALPACA_KEY = os.getenv("ALPACA_API_KEY")
+_ALPACA_SECRET = os.getenv("ALPACA_SECRET_KEY")
+_ALPACA_BASE_URL = "https://paper-api.alpaca.markets" if config.ALPACA_PAPER else "https://api.alpaca.markets"
+
 _module_api_client = None
 
 def _initialize_api_client():
@@ -17,15 +24,11 @@ def _initialize_api_client():
     if _module_api_client:
         return _module_api_client
 
-    api_key_env = os.getenv("ALPACA_API_KEY")
-    secret_key_env = os.getenv("ALPACA_SECRET_KEY")
-    base_url_env = "https://paper-api.alpaca.markets" if config.ALPACA_PAPER else "https://api.alpaca.markets"
-
-    if not api_key_env or not secret_key_env:
+    if not _ALPACA_KEY or not _ALPACA_SECRET:
         logger.log_action("CRITICAL: Data Fetcher - Alpaca API Key or Secret Key not found in .env file.")
         return None
     try:
-        client = tradeapi.REST(api_key_env, secret_key_env, base_url=base_url_env)
+        client = tradeapi.REST(_ALPACA_KEY, _ALPACA_SECRET, base_url=_ALPACA_BASE_URL)
         account = client.get_account()
         logger.log_action(f"Data Fetcher: Successfully initialized Alpaca API. Account Status: {account.status}")
         _module_api_client = client
@@ -34,11 +37,35 @@ def _initialize_api_client():
         logger.log_action(f"ERROR: Data Fetcher - Could not connect to Alpaca API: {e}")
         return None
 
+def _load_bars_cache():
+    """Returns the cached historical bars DataFrame, or None if absent/unreadable."""
+    try:
+        if os.path.isfile(config.BARS_CACHE_FILE):
+            return pd.read_pickle(config.BARS_CACHE_FILE)
+    except Exception as e:
+        logger.log_action(f"Data Fetcher: Could not read bars cache {config.BARS_CACHE_FILE}: {e}. Refetching full history.")
+    return None
+
+def _save_bars_cache(bars_df):
+    """Atomically persists the bars DataFrame for reuse by the next run."""
+    try:
+        os.makedirs(os.path.dirname(config.BARS_CACHE_FILE), exist_ok=True)
+        tmp_path = config.BARS_CACHE_FILE + '.tmp'
+        bars_df.to_pickle(tmp_path)
+        os.replace(tmp_path, config.BARS_CACHE_FILE)
+    except Exception as e:
+        logger.log_action(f"Data Fetcher: Could not write bars cache {config.BARS_CACHE_FILE}: {e}")
+
 def get_historical_data(tickers, timeframe='1Day', trading_days_limit=200, api_client=None):
     """
     Fetches historical bar data for multiple tickers for a specified number of trading days.
     The Alpaca SDK's `get_bars().df` method returns a multi-indexed DataFrame.
 
+    Daily bars older than the last session are immutable, so fetched history
+    is cached on disk (config.BARS_CACHE_FILE) and subsequent runs download
+    only the days newer than the cache — O(tickers) new bars per run instead
+    of the full window. The one cold run still pulls the full history.
+
     :param tickers: List of stock tickers.
     :param timeframe: Alpaca API timeframe (e.g., '1Day', '1Hour').
     :param trading_days_limit: Number of trading days of data to fetch.
@@ -108,14 +135,48 @@ def get_historical_data(tickers, timeframe='1Day', trading_days_limit=200, api_c
         start_date_iso = start_date_dt.isoformat()
         end_date_iso = end_date_dt.isoformat()
 
-        logger.log_action(f"Data Fetcher: Fetching historical data for {len(tickers)} tickers: {', '.join(tickers)}. Timeframe: {timeframe}, Trading Days: {actual_limit}, Start: {start_date_iso}, End: {end_date_iso}")
+        # Incremental path: when the cache covers the requested universe,
+        # reaches into the requested window, and holds at least a full
+        # window of rows per requested symbol, only download days newer than
+        # its last bar. A stale, shallow, or universe-changed cache falls
+        # back to the full fetch below. The cache itself always stays the
+        # full on-disk frame; requested slices are taken from it at return
+        # time, so a run with a narrower ticker list never shrinks it.
+        full_disk_cache = _load_bars_cache()
+        cached_bars = full_disk_cache
+        fetch_start_date_iso = start_date_iso
+        if cached_bars is not None and not cached_bars.empty:
+            try:
+                cached_symbols = set(cached_bars.index.unique(level='symbol'))
+                last_cached_date = cached_bars.index.get_level_values('timestamp').max().date()
+                requested_cached_bars = cached_bars[cached_bars.index.get_level_values('symbol').isin(tickers)]
+                # Depth per requested symbol: a cache trimmed under a smaller
+                # window passes the date checks but can never backfill
+                # incrementally, so a window increase must refetch in full.
+                min_cached_depth = int(requested_cached_bars.groupby(level='symbol', sort=False).size().min()) if not requested_cached_bars.empty else 0
+            except (KeyError, AttributeError):
+                cached_symbols, last_cached_date, min_cached_depth, requested_cached_bars = set(), None, 0, None
+            if (not cached_symbols.issuperset(tickers) or last_cached_date is None
+                    or last_cached_date < start_date_dt or min_cached_depth < actual_limit):
+                cached_bars = None
+            elif last_cached_date >= end_date_dt:
+                logger.log_action(f"Data Fetcher: Bars cache is current through {end_date_iso}; skipping download.")
+                return requested_cached_bars.groupby(level='symbol', sort=False).tail(actual_limit)
+            else:
+                fetch_start_date_iso = (last_cached_date + timedelta(days=1)).isoformat()
+        else:
+            cached_bars = None
+
+        logger.log_action(f"Data Fetcher: Fetching historical data for {len(tickers)} tickers: {', '.join(tickers)}. Timeframe: {timeframe}, Trading Days: {actual_limit}, Start: {fetch_start_date_iso}, End: {end_date_iso}")
 
         bars_df = current_api_client.get_bars(
             tickers,
             timeframe,
-            start=start_date_iso,
+            start=fetch_start_date_iso,
             end=end_date_iso, # Alpaca's end is inclusive for daily bars
-            limit=actual_limit # Add limit to ensure we don't get more than needed if date range is slightly off
+            # The row cap only makes sense for the full-window fetch; an
+            # incremental fetch is already bounded by its short date range.
+            limit=actual_limit if fetch_start_date_iso == start_date_iso else None
         ).df
 
         # Filter results to ensure we only use data within the exact date range of trading days
@@ -147,6 +208,19 @@ def get_historical_data(tickers, timeframe='1Day', trading_days_limit=200, api_c
                  logger.log_action("Error: 'symbol' or 'timestamp' columns missing after filtering/processing.")
                  return pd.DataFrame()
 
+        # Stitch new bars onto the full cached history, persist the merged
+        # cache untrimmed (deeper history stays available to larger future
+        # windows), and serve only the requested slice re-trimmed per symbol.
+        if cached_bars is not None and fetch_start_date_iso != start_date_iso:
+            if bars_df.empty:
+                logger.log_action("Data Fetcher: Incremental fetch returned no new bars; serving cached history.")
+            else:
+                cached_bars = pd.concat([cached_bars, bars_df])
+                cached_bars = cached_bars[~cached_bars.index.duplicated(keep='last')].sort_index()
+                _save_bars_cache(cached_bars)
+            bars_df = cached_bars[cached_bars.index.get_level_values('symbol').isin(tickers)]
+            bars_df = bars_df.groupby(level='symbol', sort=False).tail(actual_limit)
+
         if bars_df.empty:
             logger.log_action(f"Data Fetcher: No historical data returned for tickers: {', '.join(tickers)}")
             return pd.DataFrame()
@@ -160,6 +234,18 @@ def get_historical_data(tickers, timeframe='1Day', trading_days_limit=200, api_c
                 logger.log_action("Error: 'symbol' or 'timestamp' columns missing before final return. DataFrame malformed.")
                 return pd.DataFrame()
 
+        # Full-fetch path (the incremental path saved above): merge into any
+        # existing on-disk cache instead of overwriting it, so an invalidated
+        # pass or a narrower ticker list never discards other symbols' (or
+        # deeper) history already cached.
+        if fetch_start_date_iso == start_date_iso:
+            if full_disk_cache is not None and not full_disk_cache.empty:
+                merged_cache = pd.concat([full_disk_cache, bars_df])
+                merged_cache = merged_cache[~merged_cache.index.duplicated(keep='last')].sort_index()
+                _save_bars_cache(merged_cache)
+            else:
+                _save_bars_cache(bars_df)
+
         logger.log_action(f"Data Fetcher: Successfully fetched historical data for {len(bars_df.index.get_level_values('symbol').unique())} tickers.")
         return bars_df
 
@@ -208,7 +294,9 @@ def get_latest_prices(tickers, api_client=None):
         trades = current_api_client.get_latest_trades(tickers)
         for ticker in tickers:
             if ticker in trades and hasattr(trades[ticker], 'p'): # 'p' is price
-                latest_prices[ticker] = trades[ticker].p
+                # Normalize at the source so downstream price checks don't
+                # need per-ticker isinstance guards.
+                latest_prices[ticker] = float(trades[ticker].p)
             else:
                 logger.log_action(f"Data Fetcher: Could not get latest price for {ticker}.")
         logger.log_action(f"Data Fetcher: Fetched latest prices for {len(latest_prices)}/{len(tickers)} tickers.")
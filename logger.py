@@ -1,8 +1,26 @@
 import csv
 import os
+import time
 from datetime import datetime
 import config
 
+# When False, verbose per-ticker diagnostics routed through log_debug are
+# skipped entirely, avoiding per-iteration string formatting and disk writes
+# in tight loops (e.g. position management over many tickers).
+debug_enabled = False
+
+def log_debug(message, *args):
+    """
+    Logs a verbose diagnostic message only when `debug_enabled` is True.
+    Supports lazy %-style formatting: the message is only formatted (and
+    written) if debug logging is enabled.
+    :param message: The message string, optionally with %-style placeholders.
+    :param args: Values for the %-style placeholders.
+    """
+    if not debug_enabled:
+        return
+    log_action(message % args if args else message)
+
 def log_action(message):
     """
     Logs an action message to the bot's log file with a timestamp.
@@ -10,7 +28,9 @@ def log_action(message):
     """
     os.makedirs(os.path.dirname(config.LOG_FILE), exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # time.strftime formats straight from the C time struct — no datetime
+    # object built and discarded per log line.
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
     log_entry = f"{timestamp} - {message}\n"
     try:
         with open(config.LOG_FILE, 'a') as f:
@@ -19,9 +39,59 @@ def log_action(message):
         # Fallback to print if logging to file fails
         print(f"CRITICAL: Error writing to log file {config.LOG_FILE}: {e}. Log message: {log_entry.strip()}")
 
+def log_actions_batch(messages):
+    """
+    Logs a sequence of messages with one timestamp and a single file
+    open/write, instead of one open+write syscall per message.
+    :param messages: Iterable of message strings.
+    """
+    if not messages:
+        return
+    os.makedirs(os.path.dirname(config.LOG_FILE), exist_ok=True)
+
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    lines = [f"{timestamp} - {message}\n" for message in messages]
+    try:
+        with open(config.LOG_FILE, 'a') as f:
+            f.writelines(lines)
+    except Exception as e:
+        # Fallback to print if logging to file fails
+        print(f"CRITICAL: Error writing to log file {config.LOG_FILE}: {e}. Dropped {len(lines)} batched messages.")
+
+# Long-lived trades CSV writer. Opening the file once per process (instead of
+# per record_trade call) turns each recorded exit into a buffered write; a
+# bulk-exit cycle then costs one open/close pair instead of one per trade.
+_trades_fieldnames = ['Ticker', 'EntryDate', 'ExitDate', 'EntryPrice', 'ExitPrice', 'ProfitLoss', 'ExitReason']
+_trades_fh = None
+_trades_writer = None
+
+def _get_trades_writer():
+    """Lazily opens the trades CSV and returns a persistent DictWriter."""
+    global _trades_fh, _trades_writer
+    if _trades_writer is None:
+        os.makedirs(os.path.dirname(config.TRADES_CSV_FILE), exist_ok=True)
+        write_header = not os.path.isfile(config.TRADES_CSV_FILE) or os.path.getsize(config.TRADES_CSV_FILE) == 0
+        _trades_fh = open(config.TRADES_CSV_FILE, 'a', newline='')
+        _trades_writer = csv.DictWriter(_trades_fh, fieldnames=_trades_fieldnames)
+        if write_header:
+            _trades_writer.writeheader()
+    return _trades_writer
+
+def flush_trades():
+    """
+    Flushes buffered trade rows to disk. Call once after a batch of
+    record_trade calls (e.g. at the end of a management cycle).
+    """
+    if _trades_fh is not None:
+        try:
+            _trades_fh.flush()
+        except Exception as e:
+            print(f"CRITICAL: Error flushing trades CSV {config.TRADES_CSV_FILE}: {e}")
+
 def record_trade(ticker, entry_date, exit_date, entry_price, exit_price, profit_loss, reason_for_exit):
     """
-    Records a completed trade to the trades CSV file.
+    Records a completed trade to the trades CSV file. Rows are buffered in
+    the persistent writer; call flush_trades() to force them to disk.
     :param ticker: Stock ticker.
     :param entry_date: Entry date/time (string or datetime).
     :param exit_date: Exit date/time (string or datetime).
@@ -30,11 +100,6 @@ def record_trade(ticker, entry_date, exit_date, entry_price, exit_price, profit_
     :param profit_loss: Profit or loss from the trade.
     :param reason_for_exit: Reason for closing the trade.
     """
-    os.makedirs(os.path.dirname(config.TRADES_CSV_FILE), exist_ok=True)
-
-    file_exists = os.path.isfile(config.TRADES_CSV_FILE)
-    fieldnames = ['Ticker', 'EntryDate', 'ExitDate', 'EntryPrice', 'ExitPrice', 'ProfitLoss', 'ExitReason']
-
     entry_date_str = entry_date.strftime('%Y-%m-%d %H:%M:%S') if isinstance(entry_date, datetime) else str(entry_date)
     exit_date_str = exit_date.strftime('%Y-%m-%d %H:%M:%S') if isinstance(exit_date, datetime) else str(exit_date)
 
@@ -49,11 +114,7 @@ def record_trade(ticker, entry_date, exit_date, entry_price, exit_price, profit_
     }
 
     try:
-        with open(config.TRADES_CSV_FILE, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if not file_exists or os.path.getsize(config.TRADES_CSV_FILE) == 0:
-                writer.writeheader()
-            writer.writerow(row)
+        _get_trades_writer().writerow(row)
         log_action(f"Recorded trade for {ticker}: P&L {profit_loss:.2f}, Exit Reason: {reason_for_exit}")
     except Exception as e:
         # Fallback to print if logging to file fails
@@ -92,6 +153,7 @@ if __name__ == '__main__':
         reason_for_exit="stop-loss"
     )
     log_action("Bot session ended.")
+    flush_trades()
 
     print(f"Log file '{config.LOG_FILE}' and CSV file '{config.TRADES_CSV_FILE}' created with example entries.")
 
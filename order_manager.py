@@ -2,10 +2,17 @@ import alpaca_trade_api as tradeapi
 import config
 import logger
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Module-level credential constants: these never change after startup, so
+# _initialize_api_client avoids re-reading the environ on each call.
+_ALPACA_KEY = os.getenv("ALPACA_API_KEY")
+_ALPACA_SECRET = os.getenv("ALPACA_SECRET_KEY")
+_ALPACA_BASE_URL = "https://paper-api.alpaca.markets" if config.ALPACA_PAPER else "https://api.alpaca.markets"
+
 _module_api_client = None
 
 def _initialize_api_client():
@@ -14,17 +21,13 @@ def _initialize_api_client():
     if _module_api_client:
         return _module_api_client
 
-    api_key_env = os.getenv("ALPACA_API_KEY")
-    secret_key_env = os.getenv("ALPACA_SECRET_KEY")
-    base_url_env = "https://paper-api.alpaca.markets" if config.ALPACA_PAPER else "https://api.alpaca.markets"
-
-    if not api_key_env or not secret_key_env:
+    if not _ALPACA_KEY or not _ALPACA_SECRET:
         logger.log_action("CRITICAL: Order Manager - Alpaca API Key or Secret Key not found in .env file.")
         return None
     try:
-        client = tradeapi.REST(api_key_env, secret_key_env, base_url=base_url_env)
+        client = tradeapi.REST(_ALPACA_KEY, _ALPACA_SECRET, base_url=_ALPACA_BASE_URL)
         client.get_account() # Test connection
-        logger.log_action(f"Order Manager: Successfully initialized Alpaca API at {base_url_env}.")
+        logger.log_action(f"Order Manager: Successfully initialized Alpaca API at {_ALPACA_BASE_URL}.")
         _module_api_client = client
         return _module_api_client
     except Exception as e:
@@ -55,6 +58,12 @@ def place_limit_order(ticker, qty, limit_price, side, api_client=None):
             limit_price=str(round(float(limit_price), 2))
         )
         logger.log_action(f"Placed {side} limit order for {qty} {ticker} @ {limit_price}. Order ID: {order.id}, Status: {order.status}")
+
+        # Placing an order changes buying power, so drop position_manager's
+        # cached cash. Imported here to avoid a circular import at load time
+        # (position_manager imports order_manager).
+        import position_manager
+        position_manager.invalidate_cash_cache()
         return order
     except tradeapi.rest.APIError as e:
         # Alpaca APIError often has a ._error attribute with the message from Alpaca
@@ -64,6 +73,44 @@ def place_limit_order(ticker, qty, limit_price, side, api_client=None):
         logger.log_action(f"Order Manager: Generic error placing {side} order for {qty} {ticker} @ {limit_price}: {e}")
         return None
 
+def place_limit_orders_batch(entry_plans, api_client=None, max_workers=8):
+    """
+    Places a batch of limit orders against one shared API client.
+    Alpaca's REST API has no multi-order endpoint, so the batch is issued as
+    concurrent requests over the client's pooled keep-alive session — a batch
+    of N orders costs roughly one network round trip instead of N sequential
+    ones. Results are returned per plan so the caller can merge them without
+    caring about completion order.
+    :param entry_plans: List of tuples whose first four fields are
+                        (ticker, qty, limit_price, side); extra trailing
+                        fields (e.g. signal, z-score) are passed through.
+    :param api_client: Optional initialized Alpaca API client, shared by all
+                       submissions in the batch.
+    :param max_workers: Maximum concurrent submissions.
+    :return: List of (plan, order_or_None) pairs, one per input plan.
+    """
+    if not entry_plans:
+        return []
+    current_api_client = api_client if api_client else _initialize_api_client()
+    if not current_api_client:
+        logger.log_action("Order Manager (place_limit_orders_batch): Alpaca API client not available.")
+        return [(plan, None) for plan in entry_plans]
+
+    def _submit(plan):
+        ticker, qty, limit_price, side = plan[0], plan[1], plan[2], plan[3]
+        try:
+            # place_limit_order already catches and logs API errors,
+            # returning None; guard against anything it lets through so one
+            # bad plan cannot sink the rest of the batch.
+            return place_limit_order(ticker, qty, limit_price, side, api_client=current_api_client)
+        except Exception as e:
+            logger.log_action(f"Order Manager (place_limit_orders_batch): Error placing {side} order for {qty} {ticker}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(entry_plans))) as executor:
+        results = list(executor.map(_submit, entry_plans))
+    return list(zip(entry_plans, results))
+
 def get_order_status(order_id, api_client=None):
     """
     Checks the status of an order.
@@ -145,7 +192,9 @@ def get_open_orders(api_client=None, tickers: list[str] = None):
 
         open_orders = current_api_client.list_orders(**params)
         count = len(open_orders)
-        logger.log_action(f"Order Manager: Found {count} open order(s) for {', '.join(tickers) if tickers else 'all symbols'}.")
+        if logger.debug_enabled:
+            # The ticker join is only built when debug logging is on.
+            logger.log_action("Order Manager: Found %d open order(s) for %s." % (count, ', '.join(tickers) if tickers else 'all symbols'))
         return open_orders
     except tradeapi.rest.APIError as e:
         logger.log_action(f"Alpaca API Error getting open orders: {e}")
@@ -153,3 +202,34 @@ def get_open_orders(api_client=None, tickers: list[str] = None):
     except Exception as e:
         logger.log_action(f"Order Manager: Generic error getting open orders: {e}")
         return []
+
+def get_closed_orders(api_client=None, after=None, limit=500):
+    """
+    Retrieves closed orders (filled, canceled, expired, ...) in one call, so
+    callers reconciling many finished orders can diff against this list
+    instead of issuing one get_order_status round trip per order.
+    :param api_client: Optional initialized Alpaca API client.
+    :param after: Optional ISO timestamp; only orders submitted after this
+                  time are returned.
+    :param limit: Maximum number of orders to return.
+    :return: List of Order objects from Alpaca, or an empty list if error.
+    """
+    current_api_client = api_client if api_client else _initialize_api_client()
+    if not current_api_client:
+        logger.log_action("Order Manager (get_closed_orders): Alpaca API client not available.")
+        return []
+
+    try:
+        params = {'status': 'closed', 'limit': limit}
+        if after:
+            params['after'] = after
+        closed_orders = current_api_client.list_orders(**params)
+        if logger.debug_enabled:
+            logger.log_action("Order Manager: Found %d closed order(s)%s." % (len(closed_orders), f" after {after}" if after else ""))
+        return closed_orders
+    except tradeapi.rest.APIError as e:
+        logger.log_action(f"Alpaca API Error getting closed orders: {e}")
+        return []
+    except Exception as e:
+        logger.log_action(f"Order Manager: Generic error getting closed orders: {e}")
+        return []
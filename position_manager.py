@@ -1,14 +1,156 @@
-import json
+import copy
 import os
+import time
+
+import orjson
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
 import pandas as pd
 import config
 import logger
 import order_manager
 import signal_generator
 
+
+@dataclass(slots=True)
+class Position:
+    """
+    In-memory record for one open position.
+
+    Slots keep per-position memory low and make field access a C-level
+    lookup in the management loop instead of a dict hash probe. Dates are
+    datetime objects in memory; conversion to/from ISO strings happens only
+    at the JSON boundary in save_positions/sync_positions_from_alpaca.
+    """
+    qty: float
+    entry_price: float
+    entry_date: datetime
+    type: str                                       # 'long' or 'short'
+    status: str = 'open'                            # 'open' or 'pending_exit'
+    entry_order_id: Optional[str] = None
+    pnl: float = 0.0
+    pending_exit_order_id: Optional[str] = None
+    pending_exit_order_placed_at: Optional[datetime] = None
+    exit_reason_for_order: Optional[str] = None
+
+    def to_dict(self):
+        """Returns a plain-dict view of the record for JSON serialization."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a Position from a dict as loaded from positions.json,
+        converting ISO date strings back to datetime objects.
+        :param data: Dict with the Position field names as keys.
+        :return: Position instance.
+        """
+        fields = dict(data)
+        for date_field in ('entry_date', 'pending_exit_order_placed_at'):
+            value = fields.get(date_field)
+            if isinstance(value, str):
+                fields[date_field] = datetime.fromisoformat(value)
+        return cls(**fields)
+
 # Alpaca API client is passed to functions needing it from trading_bot.py
 
+# Last price and z-score evaluated per ticker. When the price has not moved
+# more than config.Z_RECOMPUTE_PRICE_EPS relative to the cached price, the
+# signal cannot change, so the expensive z-score recompute is skipped.
+_last_seen_price = {}
+_last_zscore = {}
+
+# Sidecar set of tickers whose position status is currently 'open'.
+# Maintained by add_position/remove_position/sync and by status transitions,
+# so the management loop iterates only open positions instead of scanning
+# the full positions dict and filtering on status each pass.
+open_tickers = set()
+
+# Freelist of Position instances recycled between remove_position and
+# add_position, so steady-state trade turnover reuses records instead of
+# allocating a fresh one per fill and abandoning the old one to GC.
+_POSITION_POOL = []
+_POSITION_POOL_MAX = 1024
+
+def _acquire_position(qty, entry_price, entry_date, position_type, entry_order_id):
+    """Returns a pooled Position reset to the given entry fields, or a new one."""
+    if _POSITION_POOL:
+        pos = _POSITION_POOL.pop()
+        pos.qty = qty
+        pos.entry_price = entry_price
+        pos.entry_date = entry_date
+        pos.type = position_type
+        pos.status = 'open'
+        pos.entry_order_id = entry_order_id
+        pos.pnl = 0.0
+        pos.pending_exit_order_id = None
+        pos.pending_exit_order_placed_at = None
+        pos.exit_reason_for_order = None
+        return pos
+    return Position(
+        qty=qty,
+        entry_price=entry_price,
+        entry_date=entry_date,
+        type=position_type,
+        status='open',
+        entry_order_id=entry_order_id,
+        pnl=0.0
+    )
+
+def _release_position(pos):
+    """Returns a no-longer-referenced Position to the freelist (bounded)."""
+    if isinstance(pos, Position) and len(_POSITION_POOL) < _POSITION_POOL_MAX:
+        _POSITION_POOL.append(pos)
+
+# Set by mutations (add/remove/status flips) and cleared by save_positions.
+# Lets the caller coalesce redundant mid-cycle saves through
+# save_positions_if_dirty instead of rewriting an unchanged file.
+_positions_dirty = False
+
+def mark_positions_dirty():
+    """Flags the in-memory positions state as ahead of the file on disk."""
+    global _positions_dirty
+    _positions_dirty = True
+
+def save_positions_if_dirty(positions):
+    """Persists positions only if a mutation occurred since the last save."""
+    if _positions_dirty:
+        save_positions(positions)
+
+# Memoization of the parsed positions file keyed on (mtime_ns, size). When
+# the file is unchanged since the last read, a single stat() syscall replaces
+# the full read+parse. save_positions primes it after each write.
+_POS_CACHE = {'mtime': None, 'size': None, 'data': None}
+
+# Exit reason per (position type, signal) pair: one hash probe in the
+# management loop instead of four string comparisons. Misses (entry signals,
+# signals for the opposite side, NO_SIGNAL) map to None.
+_EXIT_REASON = {
+    ('long', 'EXIT_LONG'): 'exit_long_signal',
+    ('long', 'STOP_LOSS_LONG'): 'stop_loss_long_signal',
+    ('short', 'EXIT_SHORT'): 'exit_short_signal',
+    ('short', 'STOP_LOSS_SHORT'): 'stop_loss_short_signal',
+}
+
+# Config values this module reads on hot paths, bound once at import so the
+# I/O helpers use a module global instead of an attribute lookup per call.
+# These never change at runtime (config builds them from the run timestamp).
+_POSITIONS_FILE = config.POSITIONS_FILE
+
+# Positions directory, resolved once; _ensure_positions_dir makes the
+# makedirs stat-per-call a one-time cost per process.
+_POS_DIR = os.path.dirname(_POSITIONS_FILE)
+_POS_DIR_ENSURED = False
+
+def _ensure_positions_dir():
+    """Creates the positions directory once per process."""
+    global _POS_DIR_ENSURED
+    if not _POS_DIR_ENSURED:
+        os.makedirs(_POS_DIR, exist_ok=True)
+        _POS_DIR_ENSURED = True
+
 def load_positions_from_file():
     """
     Loads current open positions from the JSON file.
@@ -16,26 +158,59 @@ def load_positions_from_file():
     Date conversions and sync logic will be handled by the synchronization function.
     :return: Dict of open positions {ticker: {details}}, or {} if error/not found/invalid JSON.
     """
-    os.makedirs(os.path.dirname(config.POSITIONS_FILE), exist_ok=True)
+    _ensure_positions_dir()
 
-    if not os.path.exists(config.POSITIONS_FILE):
-        logger.log_action(f"Position Manager: Positions file not found at {config.POSITIONS_FILE}. Returning empty data.")
+    if not os.path.exists(_POSITIONS_FILE):
+        logger.log_action(f"Position Manager: Positions file not found at {_POSITIONS_FILE}. Returning empty data.")
         return {}
     try:
-        with open(config.POSITIONS_FILE, 'r') as f:
+        st = os.stat(_POSITIONS_FILE)
+        if (st.st_mtime_ns, st.st_size) == (_POS_CACHE['mtime'], _POS_CACHE['size']):
+            # File unchanged since last parse; hand back a private copy.
+            return copy.deepcopy(_POS_CACHE['data'])
+
+        with open(_POSITIONS_FILE, 'rb') as f: # orjson consumes bytes
             content = f.read()
             if not content.strip(): # Handle empty file
-                logger.log_action(f"Position Manager: Positions file {config.POSITIONS_FILE} is empty. Returning empty data.")
+                logger.log_action(f"Position Manager: Positions file {_POSITIONS_FILE} is empty. Returning empty data.")
                 return {}
-            positions_raw = json.loads(content)
+            positions_raw = orjson.loads(content)
+
+        _POS_CACHE['mtime'], _POS_CACHE['size'] = st.st_mtime_ns, st.st_size
+        _POS_CACHE['data'] = copy.deepcopy(positions_raw)
         return positions_raw
-    except json.JSONDecodeError as e:
-        logger.log_action(f"Position Manager: Error decoding JSON from {config.POSITIONS_FILE}: {e}. Returning empty data.")
+    except orjson.JSONDecodeError as e:
+        logger.log_action(f"Position Manager: Error decoding JSON from {_POSITIONS_FILE}: {e}. Returning empty data.")
         return {}
     except Exception as e:
-        logger.log_action(f"Position Manager: Error loading positions from {config.POSITIONS_FILE}: {e}. Returning empty data.")
+        logger.log_action(f"Position Manager: Error loading positions from {_POSITIONS_FILE}: {e}. Returning empty data.")
         return {}
 
+def _parse_date_strs(date_strs):
+    """
+    Parses a list of ISO date strings into python datetimes (NaT for
+    missing/invalid entries). The fast path is one vectorized pandas pass;
+    positions.json routinely mixes tz-aware entry dates (parsed from Alpaca
+    filled_at) with naive sync-fallback timestamps, and pandas raises on
+    that mix even with errors='coerce', so it falls back to a per-element
+    parse.
+    :param date_strs: List of ISO date strings (None/empty allowed).
+    :return: List of datetime objects, with pd.NaT for unparseable values.
+    """
+    try:
+        return list(pd.to_datetime(date_strs, errors='coerce', format='ISO8601').to_pydatetime())
+    except ValueError:
+        parsed = []
+        for date_str in date_strs:
+            if not date_str:
+                parsed.append(pd.NaT)
+                continue
+            try:
+                parsed.append(datetime.fromisoformat(date_str.replace('Z', '+00:00')))
+            except (ValueError, TypeError):
+                parsed.append(pd.NaT)
+        return parsed
+
 def sync_positions_from_alpaca(alpaca_positions_map, local_positions_data):
     """
     Synchronizes positions based on Alpaca as the source of truth, supplemented by local data.
@@ -43,91 +218,123 @@ def sync_positions_from_alpaca(alpaca_positions_map, local_positions_data):
 
     :param alpaca_positions_map: Dict {ticker: AlpacaPositionObject} from Alpaca.
     :param local_positions_data: Dict {ticker: {details}} loaded from local positions.json.
-    :return: Dict of synchronized open positions {ticker: {details}}.
+    :return: Dict of synchronized open positions {ticker: Position}.
     """
     synced_positions = {}
     now_datetime = datetime.now()
-
-    for ticker, alpaca_pos in alpaca_positions_map.items():
+    tickers = list(alpaca_positions_map.keys())
+
+    # Parse all local date strings in two batched passes instead of two
+    # datetime.fromisoformat calls (each in a try/except) per ticker.
+    # Missing or malformed values come back as NaT and are handled per-ticker below.
+    entry_date_strs = [local_positions_data.get(t, {}).get('entry_date') for t in tickers]
+    pending_at_strs = [local_positions_data.get(t, {}).get('pending_exit_order_placed_at') for t in tickers]
+    entry_dates_parsed = _parse_date_strs(entry_date_strs)
+    pending_ats_parsed = _parse_date_strs(pending_at_strs)
+
+    for idx, ticker in enumerate(tickers):
+        alpaca_pos = alpaca_positions_map[ticker]
         local_data = local_positions_data.get(ticker, {})
-
-        # Convert date strings from local_data to datetime objects if they exist
-        entry_date_str = local_data.get('entry_date')
-        entry_date_dt = None
-        if entry_date_str:
-            try:
-                entry_date_dt = datetime.fromisoformat(entry_date_str)
-            except (TypeError, ValueError):
-                logger.log_action(f"Position Manager (sync): Invalid entry_date format '{entry_date_str}' for {ticker}. Using current time.")
-                entry_date_dt = now_datetime
-
-        pending_exit_placed_at_str = local_data.get('pending_exit_order_placed_at')
-        pending_exit_placed_at_dt = None
-        if pending_exit_placed_at_str:
-            try:
-                pending_exit_placed_at_dt = datetime.fromisoformat(pending_exit_placed_at_str)
-            except (TypeError, ValueError):
-                 logger.log_action(f"Position Manager (sync): Invalid pending_exit_order_placed_at format '{pending_exit_placed_at_str}' for {ticker}.")
-                 # This field might be None if no pending exit, so None is acceptable.
-
-        synced_pos_details = {
-            "qty": abs(float(alpaca_pos.qty)), # Ensure positive qty, type determined by 'side'
-            "entry_price": float(alpaca_pos.avg_entry_price),
-            "type": alpaca_pos.side, # 'long' or 'short'
-            "status": local_data.get('status', 'open'), # Default to 'open', can be 'pending_exit'
-            "entry_date": entry_date_dt or now_datetime, # Use local if valid, else Alpaca sync time
-            "entry_order_id": local_data.get('entry_order_id', f"ALPACA_SYNC_{now_datetime.strftime('%Y%m%d%H%M%S')}"),
-            "pnl": float(alpaca_pos.unrealized_pl), # Use Alpaca's P&L
-            "pending_exit_order_id": local_data.get('pending_exit_order_id'),
-            "pending_exit_order_placed_at": pending_exit_placed_at_dt,
-            "exit_reason_for_order": local_data.get('exit_reason_for_order')
-        }
+        # Bound-method lookup hoisted once per ticker instead of once per field.
+        lg = local_data.get
+
+        entry_date_dt = None if pd.isna(entry_dates_parsed[idx]) else entry_dates_parsed[idx]
+        if entry_date_strs[idx] and entry_date_dt is None:
+            logger.log_action(f"Position Manager (sync): Invalid entry_date format '{entry_date_strs[idx]}' for {ticker}. Using current time.")
+            entry_date_dt = now_datetime
+
+        pending_exit_placed_at_dt = None if pd.isna(pending_ats_parsed[idx]) else pending_ats_parsed[idx]
+        if pending_at_strs[idx] and pending_exit_placed_at_dt is None:
+            logger.log_action(f"Position Manager (sync): Invalid pending_exit_order_placed_at format '{pending_at_strs[idx]}' for {ticker}.")
+            # This field might be None if no pending exit, so None is acceptable.
+
+        synced_pos = Position(
+            qty=abs(float(alpaca_pos.qty)), # Ensure positive qty, type determined by 'side'
+            entry_price=float(alpaca_pos.avg_entry_price),
+            type=alpaca_pos.side, # 'long' or 'short'
+            status=lg('status', 'open'), # Default to 'open', can be 'pending_exit'
+            entry_date=entry_date_dt or now_datetime, # Use local if valid, else Alpaca sync time
+            entry_order_id=lg('entry_order_id', f"ALPACA_SYNC_{now_datetime.strftime('%Y%m%d%H%M%S')}"),
+            pnl=float(alpaca_pos.unrealized_pl), # Use Alpaca's P&L
+            pending_exit_order_id=lg('pending_exit_order_id'),
+            pending_exit_order_placed_at=pending_exit_placed_at_dt,
+            exit_reason_for_order=lg('exit_reason_for_order')
+        )
 
         # Log if Alpaca qty/price significantly differs from a previously known local one (if any)
         if local_data:
-            if abs(float(local_data.get('qty', 0)) - synced_pos_details['qty']) > 0.001: # tolerance for float comparison
-                 logger.log_action(f"Position Manager (sync): Discrepancy in qty for {ticker}. Alpaca: {synced_pos_details['qty']}, Local: {local_data.get('qty')}. Using Alpaca.")
-            if abs(float(local_data.get('entry_price', 0)) - synced_pos_details['entry_price']) > 0.01: # price tolerance
-                 logger.log_action(f"Position Manager (sync): Discrepancy in entry_price for {ticker}. Alpaca: {synced_pos_details['entry_price']:.2f}, Local: {local_data.get('entry_price')}. Using Alpaca.")
-
-        synced_positions[ticker] = synced_pos_details
-        logger.log_action(f"Position Manager (sync): Synced position for {ticker} from Alpaca. Qty: {synced_pos_details['qty']}, Entry: {synced_pos_details['entry_price']:.2f}, Type: {synced_pos_details['type']}")
-
-    # Log positions that were in local_positions_data but not in Alpaca (meaning they were likely closed)
-    for ticker, local_details in local_positions_data.items():
-        if ticker not in alpaca_positions_map:
-            logger.log_action(f"Position Manager (sync): Local position for {ticker} not found in Alpaca live positions. Assumed closed/external action.")
-            # These positions are effectively removed by not being added to synced_positions
+            local_qty = float(lg('qty', 0))
+            local_entry_price = float(lg('entry_price', 0))
+            if abs(local_qty - synced_pos.qty) > 0.001: # tolerance for float comparison
+                 logger.log_action(f"Position Manager (sync): Discrepancy in qty for {ticker}. Alpaca: {synced_pos.qty}, Local: {local_qty}. Using Alpaca.")
+            if abs(local_entry_price - synced_pos.entry_price) > 0.01: # price tolerance
+                 logger.log_action(f"Position Manager (sync): Discrepancy in entry_price for {ticker}. Alpaca: {synced_pos.entry_price:.2f}, Local: {local_entry_price}. Using Alpaca.")
+
+        synced_positions[ticker] = synced_pos
+        logger.log_action(f"Position Manager (sync): Synced position for {ticker} from Alpaca. Qty: {synced_pos.qty}, Entry: {synced_pos.entry_price:.2f}, Type: {synced_pos.type}")
+
+    # Rebuild the open-status sidecar set to match the freshly synced state.
+    open_tickers.clear()
+    open_tickers.update(t for t, pos in synced_positions.items() if pos.status == 'open')
+
+    # Log positions that were in local_positions_data but not in Alpaca
+    # (meaning they were likely closed). C-level set difference plus one
+    # batched write instead of a Python-level membership test per ticker.
+    # These positions are effectively removed by not being added to synced_positions.
+    closed_tickers = local_positions_data.keys() - alpaca_positions_map.keys()
+    if closed_tickers:
+        logger.log_actions_batch([
+            f"Position Manager (sync): Local position for {ticker} not found in Alpaca live positions. Assumed closed/external action."
+            for ticker in closed_tickers
+        ])
 
     return synced_positions
 
 def save_positions(positions):
     """
     Saves current open positions to JSON, converting datetime objects to ISO strings.
-    :param positions: Dict of open positions {ticker: {details}}.
+    :param positions: Dict of open positions {ticker: Position}.
     """
-    os.makedirs(os.path.dirname(config.POSITIONS_FILE), exist_ok=True)
+    _ensure_positions_dir()
 
     try:
-        positions_serializable = {}
-        for ticker, details in positions.items():
-            details_copy = details.copy()
-            if 'entry_date' in details_copy and isinstance(details_copy['entry_date'], datetime):
-                details_copy['entry_date'] = details_copy['entry_date'].isoformat()
-            if 'pending_exit_order_placed_at' in details_copy and isinstance(details_copy['pending_exit_order_placed_at'], datetime):
-                details_copy['pending_exit_order_placed_at'] = details_copy['pending_exit_order_placed_at'].isoformat()
-            positions_serializable[ticker] = details_copy
-
-        with open(config.POSITIONS_FILE, 'w') as f:
-            json.dump(positions_serializable, f, indent=4)
+        # orjson serializes datetime objects as ISO strings natively, so no
+        # manual isoformat() pass over the date fields is needed.
+        positions_serializable = {
+            ticker: details.to_dict() if isinstance(details, Position) else dict(details)
+            for ticker, details in positions.items()
+        }
+        data = orjson.dumps(positions_serializable, option=orjson.OPT_INDENT_2)
+
+        # Write to a temp file, force it to stable storage, then atomically
+        # replace, so a crash mid-write (or right after the rename) can never
+        # leave a torn or empty positions file behind.
+        tmp_path = _POSITIONS_FILE + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, _POSITIONS_FILE)
+
+        # Prime the load cache with the freshly written state so the next
+        # load_positions_from_file call is a stat()-only hit.
+        try:
+            st = os.stat(_POSITIONS_FILE)
+            _POS_CACHE['mtime'], _POS_CACHE['size'] = st.st_mtime_ns, st.st_size
+            _POS_CACHE['data'] = orjson.loads(data)
+        except OSError:
+            _POS_CACHE['mtime'] = None # Force a re-read next time
+
+        global _positions_dirty
+        _positions_dirty = False # On-disk state now matches memory
     except Exception as e:
-        logger.log_action(f"Error saving positions to {config.POSITIONS_FILE}: {e}")
+        logger.log_action(f"Error saving positions to {_POSITIONS_FILE}: {e}")
 
-def add_position(ticker, qty, entry_price, position_type, entry_order_id, entry_date=None):
+def add_position(positions, ticker, qty, entry_price, position_type, entry_order_id, entry_date=None):
     """
     Adds a new position after an entry order is filled.
-    This function now expects `positions` dict as an argument and returns the modified dict.
-    It also expects `entry_date` to be a datetime object.
+    Mutates the passed `positions` dict in place and returns the same
+    reference (no O(N) copy). It expects `entry_date` to be a datetime object.
 
     :param positions: The current dictionary of positions.
     :param ticker: Stock ticker.
@@ -136,11 +343,8 @@ def add_position(ticker, qty, entry_price, position_type, entry_order_id, entry_
     :param position_type: "long" or "short".
     :param entry_order_id: ID of the order that opened this position.
     :param entry_date: datetime object of when the entry occurred.
-    :return: Updated positions dictionary.
+    :return: The same positions dictionary, updated.
     """
-    # Ensure positions is a mutable copy if it's being passed around and modified
-    current_positions = positions.copy()
-
     if entry_date is None: # Should ideally be provided by caller based on fill time
         logger.log_action(f"Position Manager (add_position): entry_date not provided for {ticker}. Using current time.")
         entry_date = datetime.now()
@@ -152,68 +356,57 @@ def add_position(ticker, qty, entry_price, position_type, entry_order_id, entry_
             entry_date = datetime.now()
 
 
-    current_positions[ticker] = {
-        "qty": qty,
-        "entry_price": entry_price,
-        "entry_date": entry_date, # Expected to be datetime object
-        "type": position_type,       # "long" or "short"
-        "status": "open",
-        "entry_order_id": entry_order_id,
-        "pnl": 0.0, # Initial P&L is 0, can be updated from Alpaca later if needed
-        "pending_exit_order_id": None,
-        "pending_exit_order_placed_at": None,
-        "exit_reason_for_order": None
-    }
+    # entry_date is expected to be a datetime object; initial P&L is 0 and
+    # can be updated from Alpaca later if needed.
+    positions[ticker] = _acquire_position(qty, entry_price, entry_date, position_type, entry_order_id)
+    open_tickers.add(ticker)
+    mark_positions_dirty()
     # The save_positions call is removed from here; it should be managed by the calling function (e.g., in trading_bot.py after all updates)
     logger.log_action(f"Position Manager: Staged new 'open' position for save: {qty} {ticker} @ {entry_price} ({position_type}) on {entry_date.strftime('%Y-%m-%d %H:%M:%S')}. Entry Order ID: {entry_order_id}")
-    return current_positions
+    return positions
 
-def remove_position(positions, ticker, exit_price, exit_reason, exit_order_id=None):
+def remove_position(positions, ticker, exit_price, exit_reason, exit_order_id=None, as_of=None):
     """
     Removes a position from the provided dictionary and records the trade.
-    This function now expects `positions` dict as an argument and returns the modified dict.
+    Mutates the passed `positions` dict in place and returns the same
+    reference (no O(N) copy).
 
     :param positions: The current dictionary of positions.
     :param ticker: Stock ticker of the position to remove.
     :param exit_price: Price at which the position was exited.
     :param exit_reason: Reason for the exit.
     :param exit_order_id: ID of the order that closed this position (optional).
+    :param as_of: Exit timestamp for the trade record. Defaults to now;
+                  callers removing several positions in one sweep can pass a
+                  shared timestamp to avoid a clock read per removal.
     :return: Updated positions dictionary.
     """
-    current_positions = positions.copy()
-    if ticker in current_positions:
-        pos_details = current_positions.pop(ticker)
+    if ticker in positions:
+        pos_details = positions.pop(ticker)
+        open_tickers.discard(ticker)
+        mark_positions_dirty()
         # save_positions(positions) # Removed, saving handled by caller
 
         profit_loss = 0
-        # Ensure entry_date is datetime for strftime
-        entry_date_for_trade_record = pos_details['entry_date']
-        if isinstance(entry_date_for_trade_record, str):
-            try:
-                entry_date_for_trade_record = datetime.fromisoformat(entry_date_for_trade_record)
-            except ValueError:
-                logger.log_action(f"Position Manager (remove_position): Could not parse entry_date string '{pos_details['entry_date']}' for trade record. Using placeholder.")
-                entry_date_for_trade_record = datetime.now() # Fallback, though ideally should always be datetime
-        elif not isinstance(entry_date_for_trade_record, datetime):
-             logger.log_action(f"Position Manager (remove_position): entry_date '{pos_details['entry_date']}' is not datetime or string. Using placeholder.")
-             entry_date_for_trade_record = datetime.now()
+        # Upstream sync/add_position guarantee entry_date is a datetime.
+        entry_date_for_trade_record = pos_details.entry_date
+        assert isinstance(entry_date_for_trade_record, datetime), f"entry_date for {ticker} is not datetime: {type(entry_date_for_trade_record)}"
 
+        entry_price = float(pos_details.entry_price)
+        qty = float(pos_details.qty)
 
-        entry_price = float(pos_details['entry_price'])
-        qty = float(pos_details['qty'])
-
-        if pos_details['type'] == 'long':
+        if pos_details.type == 'long':
             profit_loss = (exit_price - entry_price) * qty
-        elif pos_details['type'] == 'short':
+        elif pos_details.type == 'short':
             profit_loss = (entry_price - exit_price) * qty
         else:
-            logger.log_action(f"Position Manager (remove_position): Unknown position type '{pos_details['type']}' for {ticker}. P&L calculation may be incorrect.")
+            logger.log_action(f"Position Manager (remove_position): Unknown position type '{pos_details.type}' for {ticker}. P&L calculation may be incorrect.")
 
 
         logger.record_trade(
             ticker,
-            entry_date_for_trade_record.strftime('%Y-%m-%d %H:%M:%S') if isinstance(entry_date_for_trade_record, datetime) else str(entry_date_for_trade_record),
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            entry_date_for_trade_record.strftime('%Y-%m-%d %H:%M:%S'),
+            (as_of or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
             entry_price,
             exit_price,
             profit_loss,
@@ -223,9 +416,92 @@ def remove_position(positions, ticker, exit_price, exit_reason, exit_order_id=No
         if exit_order_id:
             log_message += f" Exit Order ID: {exit_order_id}."
         logger.log_action(log_message)
+        _release_position(pos_details) # Trade is recorded; recycle the record
     else:
         logger.log_action(f"Position Manager: Attempted to remove non-existent position for {ticker} from provided dict.")
-    return current_positions
+    return positions
+
+def _compute_exit_zscore(ticker, hist_data_df, current_price):
+    """
+    Computes the current z-score for a single open position by appending
+    `current_price` to the ticker's historical close series.
+
+    Fallback path for positions that cannot join the vectorized batch in
+    _compute_exit_zscores_batch (e.g. short or malformed history).
+
+    :param ticker: Stock ticker (for logging context).
+    :param hist_data_df: Pandas DataFrame of historical bars for the ticker.
+    :param current_price: Latest trade price to append before evaluation.
+    :return: Float z-score, or None if it could not be computed.
+    """
+    if hist_data_df is None or hist_data_df.empty:
+        logger.log_debug("Position Manager: No historical data for %s to re-eval z-score for exit.", ticker)
+        return None
+
+    if 'close' not in hist_data_df.columns:
+        logger.log_action(f"Position Manager: 'close' column missing in hist data for {ticker} (exit eval).")
+        return None
+
+    try:
+        # Only the close series feeds the z-score and only the final value is
+        # consumed, so skip the DataFrame copy/reindex/concat machinery and
+        # append the current price to a flat float64 array instead.
+        closes = hist_data_df['close'].to_numpy(dtype=np.float64, copy=False)
+        closes_ext = np.empty(len(closes) + 1, dtype=np.float64)
+        closes_ext[:-1] = closes
+        closes_ext[-1] = current_price
+
+        current_z_score = signal_generator.calculate_zscore_array(closes_ext)
+        if current_z_score is not None:
+            return current_z_score
+        logger.log_action(f"Position Manager: Could not calculate current z-score for {ticker} (exit eval).")
+        return None
+    except Exception as e:
+        logger.log_action(f"Position Manager: Error during z-score calc for {ticker} exit: {e}")
+        return None
+
+
+def _compute_exit_zscores_batch(zscore_work):
+    """
+    Computes current z-scores for a batch of positions in one vectorized
+    NumPy pass. Each position contributes its trailing Z_SCORE_WINDOW - 1
+    closes plus the current price — the same window calculate_zscore would
+    evaluate at the appended price — stacked into an (N, window) array so a
+    single mean/std reduction scores every ticker at once.
+
+    Positions without enough usable history fall back to the per-ticker
+    _compute_exit_zscore path, which also handles logging.
+
+    :param zscore_work: List of (ticker, hist_data_df, current_price) tuples.
+    :return: Dict {ticker: z-score or None}.
+    """
+    results = {}
+    window = config.Z_SCORE_WINDOW
+    batch_rows = []
+    batch_tickers = []
+    for ticker, hist_data_df, current_price in zscore_work:
+        if (hist_data_df is None or hist_data_df.empty
+                or 'close' not in hist_data_df.columns
+                or len(hist_data_df) < window - 1):
+            results[ticker] = _compute_exit_zscore(ticker, hist_data_df, current_price)
+            continue
+        closes = hist_data_df['close'].to_numpy(dtype=np.float64, copy=False)
+        row = np.empty(window, dtype=np.float64)
+        row[:-1] = closes[-(window - 1):]
+        row[-1] = current_price
+        batch_rows.append(row)
+        batch_tickers.append(ticker)
+
+    if batch_rows:
+        stack = np.vstack(batch_rows)
+        means = stack.mean(axis=1)
+        stds = stack.std(axis=1, ddof=1) # ddof=1 matches pandas rolling().std()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_values = (stack[:, -1] - means) / stds
+        for ticker, z_val in zip(batch_tickers, z_values):
+            results[ticker] = float(z_val) if np.isfinite(z_val) else None
+    return results
+
 
 def check_and_manage_open_positions(current_positions_arg, current_prices, all_historical_data, api_client, alpaca_open_orders_map=None, alpaca_open_positions_map=None):
     """
@@ -233,7 +509,7 @@ def check_and_manage_open_positions(current_positions_arg, current_prices, all_h
     It now takes current_positions_arg as an argument instead of loading from file.
     The initial reconciliation with Alpaca (Phase 1) is assumed to have been done by the caller.
 
-    :param current_positions_arg: Dict of current open positions, already synced with Alpaca.
+    :param current_positions_arg: Dict {ticker: Position} of current open positions, already synced with Alpaca.
     :param current_prices: Dict of latest prices {ticker: price}.
     :param all_historical_data: Dict {ticker: pd.DataFrame} for signal re-evaluation.
     :param api_client: Initialized Alpaca API client.
@@ -241,8 +517,10 @@ def check_and_manage_open_positions(current_positions_arg, current_prices, all_h
     :param alpaca_open_positions_map: Optional Dict {ticker: AlpacaPosition} from Alpaca (can be used for verification or if needed, but primary position data is from current_positions_arg).
     :return: Updated positions dictionary.
     """
-    # positions = load_positions_from_file() # Removed: current_positions_arg is now an argument
-    positions_to_manage = current_positions_arg.copy() # Work on a copy
+    # Mutate the caller's dict in place; the loop below iterates over a
+    # list(...) snapshot, so in-place mutation is safe and the O(N) copy
+    # per call is avoided.
+    positions_to_manage = current_positions_arg
 
     alpaca_open_orders_map = alpaca_open_orders_map if alpaca_open_orders_map is not None else {}
     # alpaca_open_positions_map is available if needed for cross-check, but current_positions_arg is the primary source
@@ -250,6 +528,29 @@ def check_and_manage_open_positions(current_positions_arg, current_prices, all_h
     logger.log_action("Position Manager: Starting strategy-based management of open positions...")
     positions_updated_in_cycle = False # Tracks if any position's state changed in this function
     today = datetime.now()
+    today_ts = today.timestamp() # Float seconds for cheap age arithmetic below
+
+    # Hoist hot lookups out of the per-ticker loop: locals are LOAD_FAST,
+    # module attribute reads are a dict probe per iteration.
+    _max_hold = config.MAX_HOLDING_PERIOD_DAYS
+    _recompute_eps = config.Z_RECOMPUTE_PRICE_EPS
+    # Any position entered at or before this instant has aged past the max
+    # holding period; one subtraction here replaces per-ticker age division.
+    _hold_cutoff_ts = today_ts - _max_hold * 86400
+
+    # Per-ticker log lines are buffered and flushed in one write after the
+    # loop, instead of paying an open+write syscall per message.
+    _log_buffer = []
+    _log = _log_buffer.append
+
+    # Flat (ticker, side, rounded qty) index over Alpaca's open orders so the
+    # exit branch below does one O(1) lookup instead of scanning a ticker's
+    # order list on every exit.
+    _order_index = {
+        (order_ticker, order.side, round(float(order.qty), 3)): order
+        for order_ticker, orders in alpaca_open_orders_map.items()
+        for order in orders
+    }
 
     # --- Phase 1: Reconciliation with Alpaca's open positions ---
     # This section is SIGNIFICANTLY REDUCED as the main sync is now upstream in trading_bot.py.
@@ -260,167 +561,151 @@ def check_and_manage_open_positions(current_positions_arg, current_prices, all_h
     # This could indicate a discrepancy that should have been caught by the upstream sync or a stale map.
     if alpaca_open_positions_map is not None:
         for ticker, details in positions_to_manage.items():
-            if ticker not in alpaca_open_positions_map and details.get('status') == 'open':
+            if ticker not in alpaca_open_positions_map and details.status == 'open':
                 logger.log_action(f"Position Manager (check_and_manage): WARNING - Position {ticker} is 'open' in argument but not in provided Alpaca positions map. Upstream sync or map might be misaligned.")
 
     if not positions_to_manage:
         logger.log_action("Position Manager: No open positions to manage from argument.")
+        # Trades recorded earlier in the run (e.g. the startup exit sweep)
+        # may still sit in the CSV writer's buffer; don't leave them there.
+        logger.flush_trades()
         return positions_to_manage # Return the (empty) copied dictionary
 
     logger.log_action(f"Position Manager: Managing {len(positions_to_manage)} positions based on strategy...")
-    
-    # --- Phase 2: Apply strategy-based management to 'open' local positions ---
-    for ticker, details in list(positions_to_manage.items()):
-        if details.get('status') != 'open':
-            # logger.log_action(f"Position Manager: Skipping {ticker}, status '{details.get('status', 'unknown')}' (not 'open').") # Can be verbose
-            continue
 
+    # Pre-compute current z-scores for all 'open' positions in one vectorized
+    # batch so the management loop below only does signal logic and order
+    # placement.
+    zscore_work = []
+    current_z_scores = {}
+    for ticker in open_tickers & positions_to_manage.keys():
         current_price = current_prices.get(ticker)
-        if current_price is None or not isinstance(current_price, (int, float)) or current_price <= 0:
-            logger.log_action(f"Position Manager: Invalid/missing current price for open position {ticker} ({current_price}). Skipping management for this ticker.")
+        # Prices are normalized to float at the fetch site, so a missing or
+        # non-positive value is the only invalid case left to guard against.
+        if not current_price or current_price <= 0:
+            continue
+        last_price = _last_seen_price.get(ticker)
+        if last_price and abs(current_price - last_price) / last_price < _recompute_eps:
+            # Price has not moved meaningfully since the last evaluation;
+            # the z-score (and hence the signal) cannot have changed.
+            current_z_scores[ticker] = _last_zscore.get(ticker)
             continue
+        zscore_work.append((ticker, all_historical_data.get(ticker), current_price))
+    current_z_scores.update(_compute_exit_zscores_batch(zscore_work))
+    for ticker, _, current_price in zscore_work:
+        _last_seen_price[ticker] = current_price
+        _last_zscore[ticker] = current_z_scores.get(ticker)
+
+    # Classify every scored ticker in one vectorized pass; the loop below
+    # then reads the precomputed signal instead of walking the comparison
+    # ladder per ticker.
+    scored = [(t, z) for t, z in current_z_scores.items() if z is not None]
+    current_signals = {}
+    if scored:
+        batch_signals = signal_generator.generate_signals_batch(np.array([z for _, z in scored]))
+        current_signals = {t: sig for (t, _), sig in zip(scored, batch_signals)}
 
-        # Ensure entry_date is a datetime object for calculations
-        entry_date = details['entry_date'] # Should be datetime from sync_positions_from_alpaca
-        if not isinstance(entry_date, datetime): # Defensive check
-            logger.log_action(f"Position Manager: Entry_date for {ticker} is not a datetime object (Type: {type(entry_date)}). Attempting conversion.")
-            try:
-                entry_date = datetime.fromisoformat(str(entry_date))
-                positions_to_manage[ticker]['entry_date'] = entry_date
-            except (ValueError, TypeError):
-                logger.log_action(f"Position Manager: Invalid entry_date format for {ticker} ('{details['entry_date']}') during management. Skipping age check.")
-                continue
+    # --- Phase 2: Apply strategy-based management to 'open' local positions ---
+    # Iterate only the open-status sidecar set (snapshotted to a list since
+    # exits mutate both the set and the positions dict mid-loop).
+    for ticker in list(open_tickers & positions_to_manage.keys()):
+        details = positions_to_manage[ticker]
+        current_price = current_prices.get(ticker)
+        if not current_price or current_price <= 0:
+            _log(f"Position Manager: Invalid/missing current price for open position {ticker} ({current_price}). Skipping management for this ticker.")
+            continue
 
+        # sync_positions_from_alpaca/add_position guarantee a datetime here;
+        # the assert documents the contract and strips under -O.
+        entry_date = details.entry_date
+        assert isinstance(entry_date, datetime), f"entry_date for {ticker} is not datetime: {type(entry_date)}"
 
-        qty_to_close = float(details['qty'])
-        position_type = details['type']
+        qty_to_close = float(details.qty)
+        position_type = details.type
         exit_order_placed_this_cycle = False
         exit_reason = None
 
-        # 1. Check Max Holding Period
-        if isinstance(entry_date, datetime): # Redundant due to check above, but safe
-            if (today - entry_date).days >= config.MAX_HOLDING_PERIOD_DAYS:
-                logger.log_action(f"Position Manager: {ticker} ({position_type}) hit max hold ({config.MAX_HOLDING_PERIOD_DAYS} days). Entry: {entry_date.strftime('%Y-%m-%d')}, Today: {today.strftime('%Y-%m-%d')}")
-                exit_reason = f"max_hold_{config.MAX_HOLDING_PERIOD_DAYS}_days"
-        # else: # Already logged above
-            # logger.log_action(f"Position Manager: Cannot check max hold for {ticker} due to invalid entry_date type: {type(entry_date)}")
+        # 1. Check Max Holding Period. Age is computed on POSIX float
+        # timestamps — two C-level calls and a float divide — instead of
+        # allocating a timedelta per position.
+        if entry_date.timestamp() <= _hold_cutoff_ts:
+            _log(f"Position Manager: {ticker} ({position_type}) hit max hold ({_max_hold} days). Entry: {entry_date.strftime('%Y-%m-%d')}, Today: {today.strftime('%Y-%m-%d')}")
+            exit_reason = f"max_hold_{_max_hold}_days"
 
 
         # 2. Check Z-Score Based Exit/Stop-Loss (if not already exiting due to max hold)
         if not exit_reason:
-            ticker_hist_data_for_z = all_historical_data.get(ticker)
-            if ticker_hist_data_for_z is None or ticker_hist_data_for_z.empty:
-                logger.log_action(f"Position Manager: No historical data for {ticker} to re-eval z-score for exit.")
-            else:
-                temp_hist_data = ticker_hist_data_for_z.copy()
-                if 'close' not in temp_hist_data.columns:
-                    logger.log_action(f"Position Manager: 'close' column missing in hist data for {ticker} (exit eval).")
-                else:
-                    try:
-                        if not isinstance(temp_hist_data.index, pd.DatetimeIndex):
-                            logger.log_action(f"Position Manager: Historical data for {ticker} does not have a DatetimeIndex. Cannot reliably append current price for Z-score.")
-                        else:
-                            # Create a new row for the current price, ensuring timezone compatibility
-                            current_price_timestamp = pd.Timestamp.now()
-                            if temp_hist_data.index.tz:
-                                current_price_timestamp = current_price_timestamp.tz_localize(temp_hist_data.index.tz)
-                            else:
-                                current_price_timestamp = current_price_timestamp.tz_localize(None) # Ensure no tz if original has none
-
-                            current_price_row = pd.DataFrame({'close': [current_price]}, index=[current_price_timestamp])
-
-                            # Align columns for concatenation
-                            for col_header in temp_hist_data.columns:
-                                if col_header not in current_price_row.columns: current_price_row[col_header] = pd.NA
-                            # Ensure all columns from current_price_row are in temp_hist_data for concat
-                            # This might add new columns to temp_hist_data if current_price_row has unique ones not related to 'close'
-                            for col_header in current_price_row.columns:
-                                if col_header not in temp_hist_data.columns: temp_hist_data[col_header] = pd.NA
-
-                            # Ensure order of columns is the same to avoid performance warning or use specific columns
-                            # Only select columns that are in both, or ensure temp_hist_data has all from current_price_row
-                            common_cols = temp_hist_data.columns.intersection(current_price_row.columns)
-                            aligned_current_price_row = current_price_row[common_cols]
-                            # If temp_hist_data is missing columns that aligned_current_price_row has (shouldn't happen if common_cols is used right)
-                            # For safety, reindex temp_hist_data to include all columns from aligned_current_price_row, filled with NA
-                            temp_hist_data_reindexed = temp_hist_data.reindex(columns=temp_hist_data.columns.union(aligned_current_price_row.columns), fill_value=pd.NA)
-
-                            temp_hist_data_with_current = pd.concat([temp_hist_data_reindexed, aligned_current_price_row])
-
-
-                            current_z_score_series = signal_generator.calculate_zscore(temp_hist_data_with_current['close'])
-                            if current_z_score_series is not None and not current_z_score_series.empty and not pd.isna(current_z_score_series.iloc[-1]):
-                                current_z_score = current_z_score_series.iloc[-1]
-                                logger.log_action(f"Position Manager: Z-score for {ticker} ({position_type}) is {current_z_score:.2f} (exit eval).")
-                                signal = signal_generator.generate_signals(ticker, position_type, current_z_score=current_z_score)
-
-                                if position_type == 'long' and signal in ["EXIT_LONG", "STOP_LOSS_LONG"]:
-                                    exit_reason = f"{signal.lower()}_signal"
-                                elif position_type == 'short' and signal in ["EXIT_SHORT", "STOP_LOSS_SHORT"]:
-                                    exit_reason = f"{signal.lower()}_signal"
-
-                                if exit_reason:
-                                    logger.log_action(f"Position Manager: Signal '{signal}' triggered exit for {ticker} ({position_type}). Reason: {exit_reason}")
-                            else:
-                                logger.log_action(f"Position Manager: Could not calculate current z-score for {ticker} (exit eval).")
-                    except Exception as e:
-                        logger.log_action(f"Position Manager: Error during z-score/signal gen for {ticker} exit: {e}")
+            current_z_score = current_z_scores.get(ticker)
+            if current_z_score is not None:
+                logger.log_debug("Position Manager: Z-score for %s (%s) is %.2f (exit eval).", ticker, position_type, current_z_score)
+                signal = current_signals.get(ticker, "NO_SIGNAL")
+
+                exit_reason = _EXIT_REASON.get((position_type, signal))
+
+                if exit_reason:
+                    _log(f"Position Manager: Signal '{signal}' triggered exit for {ticker} ({position_type}). Reason: {exit_reason}")
 
         # 3. Place Exit Order if reason determined
         if exit_reason:
             side_to_close = 'sell' if position_type == 'long' else 'buy'
-            already_existing_exit_order = None
-            if ticker in alpaca_open_orders_map:
-                for order in alpaca_open_orders_map[ticker]:
-                    if order.side == side_to_close and abs(float(order.qty) - qty_to_close) < 0.001 :
-                        logger.log_action(f"Position Manager: Found existing Alpaca order {order.id} for {ticker} matching exit side '{side_to_close}' and quantity.")
-                        already_existing_exit_order = order
-                        break
+            already_existing_exit_order = _order_index.get((ticker, side_to_close, round(qty_to_close, 3)))
+            if already_existing_exit_order:
+                _log(f"Position Manager: Found existing Alpaca order {already_existing_exit_order.id} for {ticker} matching exit side '{side_to_close}' and quantity.")
 
             if already_existing_exit_order:
-                logger.log_action(f"Position Manager: Using existing Alpaca order {already_existing_exit_order.id} for {ticker} exit.")
-                if positions_to_manage[ticker].get('pending_exit_order_id') != already_existing_exit_order.id:
-                    positions_to_manage[ticker]['status'] = 'pending_exit'
-                    positions_to_manage[ticker]['pending_exit_order_id'] = already_existing_exit_order.id
-                    submitted_at_dt = datetime.now()
+                _log(f"Position Manager: Using existing Alpaca order {already_existing_exit_order.id} for {ticker} exit.")
+                if details.pending_exit_order_id != already_existing_exit_order.id:
+                    details.status = 'pending_exit'
+                    open_tickers.discard(ticker)
+                    details.pending_exit_order_id = already_existing_exit_order.id
+                    submitted_at_dt = today
                     if hasattr(already_existing_exit_order, 'submitted_at') and already_existing_exit_order.submitted_at:
                         try:
                             submitted_at_val = already_existing_exit_order.submitted_at
-                            if isinstance(submitted_at_val, str):
-                                submitted_at_dt = pd.to_datetime(submitted_at_val).to_pydatetime()
-                            elif isinstance(submitted_at_val, datetime): # Handle if it's already datetime
+                            if isinstance(submitted_at_val, datetime): # Handle if it's already datetime
                                 submitted_at_dt = submitted_at_val
+                            elif isinstance(submitted_at_val, str):
+                                # Alpaca returns ISO 8601 strings; fromisoformat is
+                                # far cheaper than pandas' inference-based parser.
+                                submitted_at_dt = datetime.fromisoformat(submitted_at_val)
                             # Alpaca SDK might use pendulum, convert if so
-                            elif hasattr(submitted_at_val, 'strftime'): # Duck-typing for datetime-like
-                                # Attempt to convert to standard datetime if it's a custom datetime-like object (e.g. pendulum)
-                                submitted_at_dt = datetime.fromisoformat(submitted_at_val.isoformat()) if hasattr(submitted_at_val, 'isoformat') else submitted_at_dt
+                            elif hasattr(submitted_at_val, 'isoformat'): # Duck-typing for datetime-like
+                                # Convert custom datetime-like objects (e.g. pendulum) to standard datetime
+                                submitted_at_dt = datetime.fromisoformat(submitted_at_val.isoformat())
                         except Exception as e_ts:
-                            logger.log_action(f"Position Manager: Could not parse/convert submitted_at for order {already_existing_exit_order.id}: {e_ts}")
-                    positions_to_manage[ticker]['pending_exit_order_placed_at'] = submitted_at_dt # Store as datetime
-                    positions_to_manage[ticker]['exit_reason_for_order'] = exit_reason
+                            _log(f"Position Manager: Could not parse/convert submitted_at for order {already_existing_exit_order.id}: {e_ts}")
+                    details.pending_exit_order_placed_at = submitted_at_dt # Store as datetime
+                    details.exit_reason_for_order = exit_reason
                     positions_updated_in_cycle = True
                 exit_order_placed_this_cycle = True
             else:
-                logger.log_action(f"Position Manager: Attempting {side_to_close} order for {int(qty_to_close)} {ticker} @ limit {current_price:.2f} due to: {exit_reason}")
+                _log(f"Position Manager: Attempting {side_to_close} order for {int(qty_to_close)} {ticker} @ limit {current_price:.2f} due to: {exit_reason}")
                 # Ensure qty_to_close is int for Alpaca if it expects int
                 exit_order_obj = order_manager.place_limit_order(ticker, int(qty_to_close), current_price, side_to_close, api_client=api_client)
 
                 if exit_order_obj and hasattr(exit_order_obj, 'id'):
-                    logger.log_action(f"Position Manager: Exit order {exit_order_obj.id} placed for {ticker}. Status: {exit_order_obj.status}")
-                    positions_to_manage[ticker]['status'] = 'pending_exit'
-                    positions_to_manage[ticker]['pending_exit_order_id'] = exit_order_obj.id
-                    positions_to_manage[ticker]['pending_exit_order_placed_at'] = datetime.now() # Store as datetime
-                    positions_to_manage[ticker]['exit_reason_for_order'] = exit_reason
+                    _log(f"Position Manager: Exit order {exit_order_obj.id} placed for {ticker}. Status: {exit_order_obj.status}")
+                    details.status = 'pending_exit'
+                    open_tickers.discard(ticker)
+                    details.pending_exit_order_id = exit_order_obj.id
+                    details.pending_exit_order_placed_at = today # Store as datetime
+                    details.exit_reason_for_order = exit_reason
                     exit_order_placed_this_cycle = True
                     positions_updated_in_cycle = True
                 else:
-                    logger.log_action(f"Position Manager: Failed to place exit order for {ticker} (Reason: {exit_reason}). Will retry next run if applicable.")
+                    _log(f"Position Manager: Failed to place exit order for {ticker} (Reason: {exit_reason}). Will retry next run if applicable.")
 
         if exit_order_placed_this_cycle:
             continue
 
+    logger.log_actions_batch(_log_buffer)
+    # Any trades recorded by remove_position during this cycle are buffered
+    # in logger's persistent CSV writer; push them to disk in one go.
+    logger.flush_trades()
+
     # No save_positions(positions_to_manage) here. The calling function in trading_bot.py will handle saving the state.
     if positions_updated_in_cycle:
+        mark_positions_dirty()
         logger.log_action("Position Manager: Positions dictionary was updated during management cycle.")
     else:
         logger.log_action("Position Manager: No positions were updated during management cycle.")
@@ -437,18 +722,42 @@ def get_pdt_trade_count(lookback_days=5):
     logger.log_action("PDT check: Simplified placeholder implementation. Returns 0.")
     return 0
 
-def get_available_cash(api_client):
+# Cached Alpaca buying power with a short TTL. Buying power only moves on
+# fills, so repeat checks within the TTL skip the REST round-trip;
+# order_manager invalidates the cache whenever it places an order.
+_CASH_CACHE = {'ts': 0.0, 'value': 0.0}
+CASH_CACHE_TTL_SECONDS = 5.0
+
+def invalidate_cash_cache():
+    """Drops the cached buying power (called after placing/filling orders)."""
+    _CASH_CACHE['ts'] = 0.0
+
+def get_available_cash(api_client, account=None):
     """
-    Gets available buying power from Alpaca account.
+    Gets available buying power from Alpaca account, cached for a short TTL.
     :param api_client: Initialized Alpaca API client.
+    :param account: Optional already-fetched Account object; when given (and
+                    the cache is stale) its buying_power is used instead of
+                    issuing another get_account round trip.
     :return: Available cash as float, or 0.0 if error.
     """
     if not api_client: # Should not happen if called from trading_bot
         logger.log_action("Position Manager (get_available_cash): API client is None. Returning 0.0 cash.")
         return 0.0
+    if time.monotonic() - _CASH_CACHE['ts'] < CASH_CACHE_TTL_SECONDS:
+        return _CASH_CACHE['value']
+    if account is not None:
+        try:
+            _CASH_CACHE['value'] = float(account.buying_power)
+            _CASH_CACHE['ts'] = time.monotonic()
+            return _CASH_CACHE['value']
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.log_action(f"Position Manager (get_available_cash): Bad account snapshot ({e}). Refetching.")
     try:
         account_info = api_client.get_account()
-        return float(account_info.buying_power)
+        _CASH_CACHE['value'] = float(account_info.buying_power)
+        _CASH_CACHE['ts'] = time.monotonic()
+        return _CASH_CACHE['value']
     except Exception as e:
         logger.log_action(f"Error fetching account info for cash: {e}")
         return 0.0
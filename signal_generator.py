@@ -1,8 +1,117 @@
+import math
+from bisect import bisect_right
+
 import pandas as pd
 import numpy as np
 import config
 import logger
 
+# Strategy parameters bound once at import: every per-tick call below reads
+# a module global instead of re-resolving the attribute on config. These are
+# constants for the life of the process.
+_Z_WINDOW = config.Z_SCORE_WINDOW
+_Z_DTYPE = np.float32 if config.Z_SCORE_FP32 else np.float64
+_Z_ENTRY_LONG = config.Z_ENTRY_LONG
+_Z_ENTRY_SHORT = config.Z_ENTRY_SHORT
+_Z_EXIT_LONG = config.Z_EXIT_LONG
+_Z_EXIT_SHORT = config.Z_EXIT_SHORT
+_Z_STOP_LOSS_LONG = config.Z_STOP_LOSS_LONG
+_Z_STOP_LOSS_SHORT = config.Z_STOP_LOSS_SHORT
+
+# The interval tables below bake in this ordering; validate it once at
+# import so a bad config edit fails fast instead of silently misclassifying.
+assert _Z_STOP_LOSS_LONG < _Z_ENTRY_LONG < _Z_EXIT_LONG < _Z_EXIT_SHORT < _Z_ENTRY_SHORT < _Z_STOP_LOSS_SHORT, \
+    "config z-score thresholds must satisfy Z_STOP_LOSS_LONG < Z_ENTRY_LONG < Z_EXIT_LONG < Z_EXIT_SHORT < Z_ENTRY_SHORT < Z_STOP_LOSS_SHORT"
+
+# Numba is optional: when present, the latest-z-score kernel below runs as
+# compiled machine code (one O(window) pass, no intermediate arrays). When
+# absent, calculate_zscore_array falls back to the NumPy reductions.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+if _njit is not None:
+    @_njit(cache=True)
+    def _latest_zscore_kernel(arr, window):
+        """Sample z-score (ddof=1) of arr's last element over its trailing window."""
+        n = arr.shape[0]
+        s = 0.0
+        s2 = 0.0
+        for i in range(n - window, n):
+            x = arr[i]
+            s += x
+            s2 += x * x
+        m = s / window
+        var = (s2 - window * m * m) / (window - 1)
+        if var > 0.0:
+            return (arr[n - 1] - m) / math.sqrt(var)
+        return math.nan
+
+    @_njit(cache=True)
+    def _rolling_zscore_kernel(arr, window):
+        """
+        Rolling z-score over the whole series in one pass: running sum and
+        sum-of-squares are updated as the window slides, so the data is
+        streamed once instead of reduced per window. Sample std (ddof=1);
+        zero-variance windows re-emit the last valid score, folding the
+        forward-fill the callers previously applied into this same pass.
+
+        Both accumulators are Kahan-compensated: the sliding add/remove
+        pattern otherwise accumulates cancellation error over long series
+        (the classic negative-variance pathology), and the two extra FLOPs
+        per element are free in this memory-bound loop. Sub-ULP negative
+        variances are clamped to zero.
+        """
+        n = arr.shape[0]
+        out = np.empty(n, dtype=arr.dtype)
+        last_valid = np.nan
+        s = 0.0
+        c_s = 0.0
+        s2 = 0.0
+        c_s2 = 0.0
+        for i in range(window - 1):
+            x = arr[i]
+            y = x - c_s
+            t = s + y
+            c_s = (t - s) - y
+            s = t
+            y = x * x - c_s2
+            t = s2 + y
+            c_s2 = (t - s2) - y
+            s2 = t
+            out[i] = np.nan
+        for i in range(window - 1, n):
+            x = arr[i]
+            y = x - c_s
+            t = s + y
+            c_s = (t - s) - y
+            s = t
+            y = x * x - c_s2
+            t = s2 + y
+            c_s2 = (t - s2) - y
+            s2 = t
+            m = s / window
+            var = (s2 - window * m * m) / (window - 1)
+            if var < 0.0:
+                var = 0.0
+            if var > 0.0:
+                last_valid = (x - m) / math.sqrt(var)
+            out[i] = last_valid
+            x_old = arr[i - window + 1]
+            y = -x_old - c_s
+            t = s + y
+            c_s = (t - s) - y
+            s = t
+            y = -(x_old * x_old) - c_s2
+            t = s2 + y
+            c_s2 = (t - s2) - y
+            s2 = t
+        return out
+else:
+    _latest_zscore_kernel = None
+    _rolling_zscore_kernel = None
+
 def calculate_zscore(prices_df):
     """
     Calculates z-scores for a price series.
@@ -10,9 +119,9 @@ def calculate_zscore(prices_df):
                       Assumes index is time-sorted.
     :return: Pandas Series of z-scores, or None if input is insufficient/malformed.
     """
-    if prices_df is None or len(prices_df) < config.Z_SCORE_WINDOW:
+    if prices_df is None or len(prices_df) < _Z_WINDOW:
         # Logger call already exists in original, good for debugging
-        logger.log_action(f"Z-score calculation: Insufficient data. Need {config.Z_SCORE_WINDOW}, got {len(prices_df) if prices_df is not None else 0}.")
+        logger.log_action(f"Z-score calculation: Insufficient data. Need {_Z_WINDOW}, got {len(prices_df) if prices_df is not None else 0}.")
         return None
 
     if isinstance(prices_df, pd.Series):
@@ -29,12 +138,92 @@ def calculate_zscore(prices_df):
         logger.log_action("Error: Price data for z-score is not a Pandas Series after extraction.")
         return None
 
-    moving_avg = prices.rolling(window=config.Z_SCORE_WINDOW).mean()
-    rolling_std = prices.rolling(window=config.Z_SCORE_WINDOW).std()
+    window = _Z_WINDOW
+    # _Z_DTYPE is float32 when config.Z_SCORE_FP32 is set, halving the bytes
+    # streamed through the kernel; the accumulators still run in float64.
+    arr = prices.to_numpy(dtype=_Z_DTYPE)
+
+    # Preferred path: one compiled streaming pass with a sliding running
+    # sum/sum-of-squares — O(n) work and a single traversal of the data.
+    # NaN prices would poison the running sums, so such series (and the
+    # no-numba case) take the windowed NumPy reduction below instead.
+    if _rolling_zscore_kernel is not None and not np.isnan(arr).any():
+        arr = np.ascontiguousarray(arr)
+        # The forward-fill is folded into the kernel (zero-variance windows
+        # re-emit the last valid score), so no second pass is needed.
+        return pd.Series(_rolling_zscore_kernel(arr, window), index=prices.index)
+    else:
+        # Reduce one zero-copy sliding-window view instead of two pandas
+        # rolling passes.
+        windows = np.lib.stride_tricks.sliding_window_view(arr, window)
+        means = windows.mean(axis=1)
+        stds = windows.std(axis=1, ddof=1) # ddof=1 matches pandas rolling().std()
+
+        z_scores = np.full(len(arr), np.nan)
+        # Replace std=0 with NaN before division to avoid inf/-inf.
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_scores[window - 1:] = (arr[window - 1:] - means) / np.where(stds == 0, np.nan, stds)
+    # Forward fill, as before, so transient NaNs reuse the last valid score.
+    return pd.Series(z_scores, index=prices.index).ffill()
+
+def calculate_zscore_array(prices_arr):
+    """
+    Calculates the latest z-score from a flat NumPy array of prices.
+    Evaluates only the trailing Z_SCORE_WINDOW values — no Series/DataFrame
+    round-trip — and matches calculate_zscore at the final index
+    (sample std, ddof=1).
+    :param prices_arr: 1-D NumPy array of prices, time-sorted.
+    :return: Float z-score for the last price, or None if input is
+             insufficient or the window std is zero/non-finite.
+    """
+    if prices_arr is None or len(prices_arr) < _Z_WINDOW:
+        logger.log_action(f"Z-score calculation: Insufficient data. Need {_Z_WINDOW}, got {len(prices_arr) if prices_arr is not None else 0}.")
+        return None
+
+    if _latest_zscore_kernel is not None:
+        tail = np.ascontiguousarray(prices_arr[-_Z_WINDOW:], dtype=np.float64)
+        z = _latest_zscore_kernel(tail, _Z_WINDOW)
+        return None if math.isnan(z) else z
+
+    tail = prices_arr[-_Z_WINDOW:]
+    std = tail.std(ddof=1)
+    if not np.isfinite(std) or std == 0:
+        return None
+    z = (tail[-1] - tail.mean()) / std
+    return float(z) if np.isfinite(z) else None
+
+# Threshold ladder for batch classification, mirroring generate_signals
+# exactly: the entry checks run first there, so z-scores beyond the
+# stop-loss thresholds still classify as BUY/SELL, and a z-score exactly on
+# a threshold falls through every strict comparison to NO_SIGNAL.
+_SIGNAL_THRESHOLDS = np.array([
+    _Z_ENTRY_LONG, _Z_EXIT_LONG, _Z_EXIT_SHORT, _Z_ENTRY_SHORT
+])
+_SIGNAL_LABELS = np.array(["BUY", "EXIT_LONG", "NO_SIGNAL", "EXIT_SHORT", "SELL"], dtype=object)
 
-    # Replace std=0 with NaN before division to avoid inf/-inf, then forward fill.
-    z_scores = (prices - moving_avg) / rolling_std.replace(0, np.nan)
-    return z_scores.ffill()
+# Scalar equivalents for the per-call path in generate_signals: one
+# bisect into the interval table replaces the comparison cascade, with
+# exact-threshold hits resolved to NO_SIGNAL via the set probe first.
+_SIGNAL_THRESHOLD_TUPLE = tuple(_SIGNAL_THRESHOLDS.tolist())
+_SIGNAL_THRESHOLD_SET = frozenset(_SIGNAL_THRESHOLD_TUPLE)
+_SIGNAL_LABEL_TUPLE = ("BUY", "EXIT_LONG", "NO_SIGNAL", "EXIT_SHORT", "SELL")
+
+def generate_signals_batch(z_scores):
+    """
+    Classifies an array of z-scores into signal strings in one vectorized
+    pass — a single C-level binary search replaces the per-ticker
+    comparison chain of generate_signals.
+    :param z_scores: 1-D NumPy array of z-scores (NaN allowed).
+    :return: NumPy object array of signal strings, aligned with the input.
+    """
+    z_scores = np.asarray(z_scores, dtype=np.float64)
+    idx = np.searchsorted(_SIGNAL_THRESHOLDS, z_scores, side='right')
+    signals = _SIGNAL_LABELS[idx]
+    # NaN and exact-threshold values short-circuit to NO_SIGNAL in the
+    # scalar ladder; replicate that here.
+    no_signal = np.isnan(z_scores) | np.isin(z_scores, _SIGNAL_THRESHOLDS)
+    signals[no_signal] = "NO_SIGNAL"
+    return signals
 
 def generate_signals(ticker, historical_data_df, current_z_score=None):
     """
@@ -53,27 +242,19 @@ def generate_signals(ticker, historical_data_df, current_z_score=None):
             return "NO_SIGNAL"
         current_z_score = z_scores.iloc[-1]
 
-    if pd.isna(current_z_score): # Check after potential calculation
+    # Callers pass a plain float (or the numpy scalar above); math.isnan is a
+    # C-level check, unlike pd.isna's polymorphic sentinel dispatch.
+    if isinstance(current_z_score, float) and math.isnan(current_z_score):
+        return "NO_SIGNAL"
+    if not isinstance(current_z_score, float) and pd.isna(current_z_score): # e.g. np.float64 NaN / NaT
         return "NO_SIGNAL"
 
-    # Entry signals
-    if current_z_score < config.Z_ENTRY_LONG:
-        return "BUY"
-    if current_z_score > config.Z_ENTRY_SHORT:
-        return "SELL" # Represents a short sell signal
-
-    # Exit signals (Position manager determines if a position is actually open)
+    # Interval lookup baking in the original comparison cascade: entry
+    # checks ran first there, so z-scores beyond the stop-loss thresholds
+    # classify as BUY/SELL (the trailing STOP_LOSS_* returns were
+    # unreachable), and exact threshold hits fell through every strict
+    # comparison to NO_SIGNAL.
     # TODO: Review these conditions to ensure they fully capture intended logic (see README TODOs)
-    if config.Z_ENTRY_LONG < current_z_score < config.Z_EXIT_LONG :
-        return "EXIT_LONG"
-    if config.Z_ENTRY_SHORT > current_z_score > config.Z_EXIT_SHORT:
-        return "EXIT_SHORT"
-
-    # Stop-loss signals
-    if current_z_score < config.Z_STOP_LOSS_LONG: # Applied by position manager if long
-        return "STOP_LOSS_LONG"
-    if current_z_score > config.Z_STOP_LOSS_SHORT: # Applied by position manager if short
-        return "STOP_LOSS_SHORT"
-
-    # Default if no other signal conditions are met
-    return "NO_SIGNAL"
+    if current_z_score in _SIGNAL_THRESHOLD_SET:
+        return "NO_SIGNAL"
+    return _SIGNAL_LABEL_TUPLE[bisect_right(_SIGNAL_THRESHOLD_TUPLE, current_z_score)]
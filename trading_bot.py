@@ -1,12 +1,18 @@
 # Main script for the mean reversion trading bot.
 
 import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+import orjson
+import numpy as np
 import pandas as pd
 
 import alpaca_trade_api as tradeapi
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import config
 import data_fetcher
@@ -17,75 +23,263 @@ import signal_generator
 
 # PENDING_ORDERS_FILE path is from config.py
 
-def initialize_api_client():
-    """Initializes and returns Alpaca API client. Keys from .env."""
-    load_dotenv()
-    api_key = os.getenv("ALPACA_API_KEY")
-    secret_key = os.getenv("ALPACA_SECRET_KEY")
-    base_url = "https://paper-api.alpaca.markets" if config.ALPACA_PAPER else "https://api.alpaca.markets"
+# Credentials and endpoint are resolved once at import: load_dotenv rescans
+# the .env file on every call, and neither the keys nor the paper/live
+# endpoint change mid-process.
+load_dotenv()
+_ALPACA_KEY = os.getenv("ALPACA_API_KEY")
+_ALPACA_SECRET = os.getenv("ALPACA_SECRET_KEY")
+_ALPACA_BASE_URL = "https://paper-api.alpaca.markets" if config.ALPACA_PAPER else "https://api.alpaca.markets"
+
+def _tune_api_session(client):
+    """
+    Configures the Alpaca client's underlying requests.Session for connection
+    reuse. The SDK already uses one Session for the process, but the default
+    adapter keeps a tiny pool; a larger pool plus explicit keep-alive lets
+    every call in the run (order sync, data fetch, reconciliation) ride the
+    same warm TLS connection instead of paying a fresh handshake. A small
+    retry policy also absorbs transient connection resets.
+    :param client: An initialized tradeapi.REST client.
+    """
+    try:
+        session = client._session # alpaca-trade-api keeps a requests.Session here
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
+        )
+        session.mount('https://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+        logger.log_action("Trading Bot: Tuned Alpaca HTTP session for keep-alive connection reuse.")
+    except Exception as e:
+        # Private SDK attribute; if its layout changes, run with defaults.
+        logger.log_action(f"Trading Bot: Could not tune Alpaca HTTP session ({e}). Using SDK defaults.")
 
-    if not api_key or not secret_key:
+def initialize_api_client():
+    """
+    Initializes the Alpaca API client. Keys from .env.
+    Returns (client, account): the Account object fetched for the connection
+    check is handed back so callers can read daytrade_count / buying power
+    off the snapshot instead of re-querying the same endpoint.
+    """
+    if not _ALPACA_KEY or not _ALPACA_SECRET:
         logger.log_action("CRITICAL: Alpaca API Key/Secret not in .env. Bot cannot run.")
-        return None
+        return None, None
     try:
-        client = tradeapi.REST(api_key, secret_key, base_url=base_url)
+        client = tradeapi.REST(_ALPACA_KEY, _ALPACA_SECRET, base_url=_ALPACA_BASE_URL)
+        _tune_api_session(client)
         account = client.get_account()
         logger.log_action(
             f"Successfully connected to Alpaca. Account: {account.id}, "
             f"Status: {account.status}, Portfolio: {account.portfolio_value}, Cash: {account.cash}"
         )
-        return client
+        return client, account
     except Exception as e:
         logger.log_action(f"ERROR: Could not connect to Alpaca API: {e}")
-        return None
+        return None, None
+
+# The state directories never move during a run; ensure them once per
+# process instead of paying a makedirs syscall on every load/save (same
+# pattern as position_manager's positions-dir flag).
+_PENDING_DIRS_ENSURED = False
+
+def _ensure_pending_dirs():
+    """Creates the pending-orders state directories on first use."""
+    global _PENDING_DIRS_ENSURED
+    if not _PENDING_DIRS_ENSURED:
+        os.makedirs(os.path.dirname(config.PENDING_ORDERS_FILE), exist_ok=True)
+        os.makedirs(os.path.dirname(config.RUN_PENDING_ORDERS_FILE), exist_ok=True)
+        _PENDING_DIRS_ENSURED = True
 
 def load_pending_orders():
     """Loads all pending orders from JSON file specified in config."""
-    os.makedirs(os.path.dirname(config.PENDING_ORDERS_FILE), exist_ok=True)
+    _ensure_pending_dirs()
     if not os.path.exists(config.PENDING_ORDERS_FILE):
         return {}
     try:
-        with open(config.PENDING_ORDERS_FILE, 'r') as f:
+        # orjson parses straight from bytes — no text decode pass first.
+        with open(config.PENDING_ORDERS_FILE, 'rb') as f:
             content = f.read()
             if not content: return {} # Handle empty file
-            return json.loads(content)
-    except json.JSONDecodeError as e:
+            return orjson.loads(content)
+    except orjson.JSONDecodeError as e:
         logger.log_action(f"Error decoding JSON from {config.PENDING_ORDERS_FILE}: {e}. Returning empty.")
         return {}
     except Exception as e:
         logger.log_action(f"Error loading pending orders from {config.PENDING_ORDERS_FILE}: {e}")
         return {}
 
+def _atomic_write_json(path, obj, pretty=False):
+    """
+    Writes obj as JSON to path via a temp file + os.replace, so a crash
+    mid-write can never leave a truncated file behind. Hot-path writes are
+    compact (no indent — roughly a third of the bytes) and skip the
+    fsync; pretty is reserved for human-readable snapshots, which also
+    get fsynced since they are the durable historical record.
+    :param path: Destination file path.
+    :param obj: JSON-serializable object.
+    :param pretty: Indent the output and fsync before the rename.
+    """
+    # orjson serializes to bytes in one C-level pass, so the file is opened
+    # in binary mode and written in a single call.
+    data = orjson.dumps(obj, option=orjson.OPT_INDENT_2) if pretty else orjson.dumps(obj)
+    _atomic_write_bytes(path, data, durable=pretty)
+
+def _atomic_write_bytes(path, data, durable=False):
+    """Atomically replaces path with data; fsyncs first when durable."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        if durable:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Digest of the last pending-orders bytes written this process. The dirty
+# bit in main() already skips most redundant saves; this catches the
+# remaining case where tracked mutations cancel out (e.g. a record removed
+# and re-added identically), leaving byte-identical output.
+_last_pending_orders_digest = None
+
 def save_pending_orders(orders):
-    """Saves pending orders dictionary to JSON file specified in config."""
-    os.makedirs(os.path.dirname(config.PENDING_ORDERS_FILE), exist_ok=True)
+    """Saves pending orders dictionary to JSON file specified in config.
+    Skips the write when the serialized bytes match the last save."""
+    global _last_pending_orders_digest
+    _ensure_pending_dirs()
     try:
-        with open(config.PENDING_ORDERS_FILE, 'w') as f:
-            json.dump(orders, f, indent=4)
+        data = orjson.dumps(orders)
+        digest = hash(data)
+        if digest == _last_pending_orders_digest:
+            return
+        _atomic_write_bytes(config.PENDING_ORDERS_FILE, data)
+        _last_pending_orders_digest = digest
     except Exception as e:
         logger.log_action(f"Error saving pending orders to {config.PENDING_ORDERS_FILE}: {e}")
 
 def save_run_pending_orders_snapshot(orders):
     """Saves a snapshot of current pending orders to a run-specific JSON file."""
-    os.makedirs(os.path.dirname(config.RUN_PENDING_ORDERS_FILE), exist_ok=True)
+    _ensure_pending_dirs()
     try:
-        with open(config.RUN_PENDING_ORDERS_FILE, 'w') as f:
-            json.dump(orders, f, indent=4)
+        _atomic_write_json(config.RUN_PENDING_ORDERS_FILE, orders, pretty=True)
         logger.log_action(f"Saved pending orders snapshot to {config.RUN_PENDING_ORDERS_FILE}")
     except Exception as e:
         logger.log_action(f"Error saving run-specific pending orders snapshot: {e}")
 
+# Free-list of pending-order record dicts, same pattern as
+# position_manager's Position pool: records cycle rapidly on busy runs
+# (created at sync/entry, dropped at reconciliation), so finished ones are
+# recycled instead of churning the allocator with a fresh 8-key dict each.
+_PENDING_RECORD_POOL = []
+_PENDING_RECORD_POOL_MAX = 1024
+
+def _acquire_pending_record():
+    """Returns a recycled pending-order record dict, or a fresh one."""
+    return _PENDING_RECORD_POOL.pop() if _PENDING_RECORD_POOL else {}
+
+def _release_pending_record(record):
+    """Clears a no-longer-tracked record and returns it to the pool."""
+    record.clear()
+    if len(_PENDING_RECORD_POOL) < _PENDING_RECORD_POOL_MAX:
+        _PENDING_RECORD_POOL.append(record)
+
+# Maximum age (seconds) of the prefetched market data for the end-of-run
+# management rerun to be worth repeating: the rerun consumes the same prices
+# and historical bars as the main pass, so on a fast cycle it would reach
+# identical exit decisions and only add API round trips.
+MARKET_DATA_FRESHNESS_SECONDS = 60
+
+# Order statuses that mean an order is finished without filling. Hoisted so
+# the reconciliation paths probe one shared frozenset instead of rebuilding
+# a list literal per order.
+_TERMINAL_ORDER_STATUSES = frozenset({'canceled', 'expired', 'rejected', 'done_for_day'})
+
+# Resolved position type per (order type, side) pair, pre-seeded with the
+# kinds the bot itself writes. Step 5's fill handler does one dict probe
+# instead of re-running three startswith scans per filled order; unseen
+# pairs (e.g. legacy types loaded from file) are classified once via the
+# original cascade and memoized. Records keep their string types — the
+# pending-orders JSON stays human-readable and backward compatible.
+_POS_TYPE_BY_ORDER_KIND = {
+    ('entry_long', 'buy'): 'long',
+    ('entry_short', 'sell'): 'short',
+    ('alpaca_sync_buy', 'buy'): 'long',
+    ('alpaca_sync_sell', 'sell'): 'short',
+}
+
+def _pos_type_for_order(order_type, side):
+    """
+    Maps a pending-order record's (type, side) to 'long'/'short'/None.
+    :param order_type: Order type string, e.g. "entry_long", "alpaca_sync_buy".
+    :param side: 'buy' or 'sell'.
+    :return: 'long', 'short', or None if the kind is unrecognized.
+    """
+    key = (order_type, side)
+    try:
+        return _POS_TYPE_BY_ORDER_KIND[key]
+    except KeyError:
+        if order_type.startswith('entry_long') or (order_type.startswith('alpaca_sync') and side == 'buy'):
+            pos_type = 'long'
+        elif order_type.startswith('entry_short') or (order_type.startswith('alpaca_sync') and side == 'sell'):
+            pos_type = 'short'
+        else:
+            pos_type = None
+        _POS_TYPE_BY_ORDER_KIND[key] = pos_type
+        return pos_type
+
+def _parse_iso(timestamp_str):
+    """
+    Parses an Alpaca RFC3339 timestamp string with datetime.fromisoformat —
+    a C-level parse, versus pd.to_datetime's polymorphic format-sniffing
+    dispatcher. pd.to_datetime is kept as the fallback for anything
+    non-ISO the API might hand back.
+    :param timestamp_str: ISO-8601/RFC3339 timestamp string.
+    :return: datetime instance.
+    """
+    try:
+        return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+    except ValueError:
+        return pd.to_datetime(timestamp_str).to_pydatetime()
+
+def _compute_entry_zscores_batch(historical_data_map):
+    """
+    Computes the latest z-score for every ticker in one vectorized pass,
+    mirroring position_manager's exit-side batch: the trailing
+    Z_SCORE_WINDOW closes of all tickers are stacked into one (N, window)
+    matrix and reduced with two NumPy ops, instead of running the full
+    rolling z-score machinery once per ticker when only the final value is
+    consumed. Zero-variance or NaN-containing windows yield NaN (no entry).
+    :param historical_data_map: Dict of ticker -> historical DataFrame with
+                                a 'close' column, time-sorted.
+    :return: Dict of ticker -> latest z-score (float, NaN allowed). Tickers
+             with missing/short history are omitted.
+    """
+    window = config.Z_SCORE_WINDOW
+    eligible = [
+        (ticker, df) for ticker, df in historical_data_map.items()
+        if df is not None and not df.empty and 'close' in df.columns and len(df) >= window
+    ]
+    if not eligible:
+        return {}
+    tails = np.vstack([df['close'].to_numpy(dtype=np.float64)[-window:] for _, df in eligible])
+    means = tails.mean(axis=1)
+    stds = tails.std(axis=1, ddof=1) # Sample std, matching signal_generator
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_scores = (tails[:, -1] - means) / np.where(stds == 0, np.nan, stds)
+    # Native floats, not numpy scalars: the z-score lands in the pending-
+    # order record as z_at_placement, and orjson refuses numpy.float64.
+    return {ticker: float(z) for (ticker, _), z in zip(eligible, z_scores)}
+
 
 def main():
     """Main execution function for the trading bot's daily cycle."""
     os.makedirs(config.CURRENT_RUN_DIR, exist_ok=True) # Ensure run directory exists
-    run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    run_timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
     logger.log_action(f"===== Trading Bot session started at {run_timestamp} =====")
 
-    api = initialize_api_client()
+    api, account = initialize_api_client()
     if not api:
         logger.log_action("Exiting: API client initialization failure.")
-        logger.log_action(f"===== Bot session ended prematurely at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =====")
+        logger.log_action(f"===== Bot session ended prematurely at {datetime.now().isoformat(sep=' ', timespec='seconds')} =====")
         return
 
     # Initial synchronization of pending_orders.json with Alpaca
@@ -93,8 +287,31 @@ def main():
     # 1. Synchronize Pending Orders with Alpaca
     logger.log_action("Initializing Bot State: Synchronizing pending orders with Alpaca...")
     local_pending_orders_from_file = load_pending_orders() # Load what bot thought was pending
-    alpaca_live_open_orders = order_manager.get_open_orders(api_client=api)
-    
+
+    # The four Alpaca fetches the run needs up front (open orders, live
+    # positions, historical bars, latest prices) have no data dependency on
+    # each other, so they are issued concurrently over the pooled keep-alive
+    # session: ~1 round trip of wall time instead of 4 sequential ones. Each
+    # fetcher handles its own errors and returns an empty result on failure.
+    with ThreadPoolExecutor(max_workers=4) as prefetch_executor:
+        open_orders_future = prefetch_executor.submit(order_manager.get_open_orders, api_client=api)
+        positions_future = prefetch_executor.submit(data_fetcher.get_alpaca_open_positions, api_client=api)
+        historical_future = prefetch_executor.submit(
+            data_fetcher.get_historical_data, config.TICKERS, timeframe='1Day',
+            limit_per_ticker=config.Z_SCORE_WINDOW + 20, # Buffer for NaNs
+            api_client=api
+        )
+        prices_future = prefetch_executor.submit(data_fetcher.get_latest_prices, config.TICKERS, api_client=api)
+        alpaca_live_open_orders = open_orders_future.result()
+        alpaca_live_positions_map = positions_future.result()
+        historical_data_multi_df = historical_future.result()
+        latest_prices = prices_future.result()
+
+    # Age of the market data snapshot; the end-of-run management rerun is
+    # skipped when this is still fresh (see MARKET_DATA_FRESHNESS_SECONDS).
+    market_data_fetched_at = time.monotonic()
+
+
     # Create a map of Alpaca live orders by ID for efficient lookup
     alpaca_live_open_orders_map_by_id = {order.id: order for order in alpaca_live_open_orders}
 
@@ -122,32 +339,42 @@ def main():
                 if isinstance(alpaca_order.submitted_at, datetime):
                     final_placed_at = alpaca_order.submitted_at.isoformat()
                 else: # Assume string
-                    final_placed_at = pd.to_datetime(alpaca_order.submitted_at).isoformat()
+                    final_placed_at = _parse_iso(alpaca_order.submitted_at).isoformat()
             except Exception as e_ts:
                 logger.log_action(f"Trading Bot (pending_order_sync): Error parsing submitted_at for order {order_id}: {e_ts}. Using fallback.")
         elif placed_at_str: # Use local if Alpaca's is missing and local is present
              final_placed_at = placed_at_str
 
 
-        current_pending_orders[order_id] = {
-            "ticker": ticker, "qty": qty, "side": side, "limit_price": limit_price,
-            "type": order_type, "placed_at": final_placed_at,
-            "z_at_placement": z_at_placement, "status": status
-        }
-        logger.log_action(f"Trading Bot (pending_order_sync): Synced/Verified pending order {order_id} ({ticker}) from Alpaca. Status: {status}")
+        record = _acquire_pending_record()
+        record.update(
+            ticker=ticker, qty=qty, side=side, limit_price=limit_price,
+            type=order_type, placed_at=final_placed_at,
+            z_at_placement=z_at_placement, status=status
+        )
+        current_pending_orders[order_id] = record
+        # Per-order diagnostics: formatted only when debug logging is on.
+        logger.log_debug("Trading Bot (pending_order_sync): Synced/Verified pending order %s (%s) from Alpaca. Status: %s", order_id, ticker, status)
 
     # Log orders that were in local file but not in Alpaca's open orders (they might have filled/cancelled)
     for order_id, local_details in local_pending_orders_from_file.items():
         if order_id not in current_pending_orders:
-            logger.log_action(f"Trading Bot (pending_order_sync): Local pending order {order_id} ({local_details.get('ticker')}) not found in Alpaca open orders. Will be re-checked in Step 5.")
+            logger.log_debug("Trading Bot (pending_order_sync): Local pending order %s (%s) not found in Alpaca open orders. Will be re-checked in Step 5.", order_id, local_details.get('ticker'))
             # These will be handled in the main reconciliation loop (Step 5) to confirm final status
 
-    save_pending_orders(current_pending_orders) # Save the Alpaca-centric view
+    # Dirty bit for the pending-orders dict: saves below are skipped when
+    # nothing has changed since the last write, so quiet runs write zero
+    # bytes. The sync view counts as dirty only if it differs from what the
+    # file already held (a one-time comparison over a small dict).
+    pending_orders_dirty = current_pending_orders != local_pending_orders_from_file
+    if pending_orders_dirty:
+        save_pending_orders(current_pending_orders) # Save the Alpaca-centric view
+        pending_orders_dirty = False
     logger.log_action(f"Trading Bot (pending_order_sync): Synchronization complete. {len(current_pending_orders)} pending orders tracked.")
 
     # 2. Synchronize Positions with Alpaca
     logger.log_action("Initializing Bot State: Synchronizing positions with Alpaca...")
-    alpaca_live_positions_map = data_fetcher.get_alpaca_open_positions(api_client=api)
+    # `alpaca_live_positions_map` was prefetched concurrently above.
     local_positions_from_file = position_manager.load_positions_from_file() # Load raw local data
 
     current_positions = position_manager.sync_positions_from_alpaca(alpaca_live_positions_map, local_positions_from_file)
@@ -160,98 +387,160 @@ def main():
     # (Renamed from "Manage Existing Positions and Orders" to better reflect its new role)
     logger.log_action("Step 1: Fetching supporting data (orders, market data)...")
 
-    # Fetch all open orders from Alpaca again (or use `alpaca_live_open_orders` if fresh enough)
+    # Reuse the open-orders snapshot already fetched during initialization:
+    # that call covered all symbols, so the per-ticker view is a local filter
+    # rather than a second REST round trip — and both consumers see one
+    # consistent snapshot (no order can fill between two fetches).
     # This is used by position_manager.check_and_manage_open_positions to see if exit orders already exist.
-    alpaca_open_orders_list_for_pm = order_manager.get_open_orders(api_client=api, tickers=config.TICKERS)
-    alpaca_open_orders_map_for_pm = {} # Ticker -> [AlpacaOrder]
+    ticker_set = set(config.TICKERS)
+    alpaca_open_orders_list_for_pm = [order for order in alpaca_live_open_orders if order.symbol in ticker_set]
+    alpaca_open_orders_map_for_pm = defaultdict(list) # Ticker -> [AlpacaOrder]
     for order in alpaca_open_orders_list_for_pm:
-        alpaca_open_orders_map_for_pm.setdefault(order.symbol, []).append(order)
+        alpaca_open_orders_map_for_pm[order.symbol].append(order)
     if not alpaca_open_orders_list_for_pm: logger.log_action("No open orders on Alpaca for configured tickers (for PM check).")
     else: logger.log_action(f"Found {len(alpaca_open_orders_list_for_pm)} open Alpaca orders for PM check.")
 
 
     # Initial check for filled/cancelled known exit orders in `current_positions`
     # This updates status from 'pending_exit' to 'open' or removes the position.
-    positions_after_exit_check = current_positions.copy() # Work on a copy
-    any_positions_changed_by_exit_check = False
-    for ticker, details in list(positions_after_exit_check.items()): # Use list for safe removal
-        if details.get('status') == 'pending_exit':
-            known_exit_order_id = details.get('pending_exit_order_id')
+    # Cheap precheck: most runs carry over no pending_exit positions, so
+    # the whole sweep (dict copy, status fan-out, per-position loop, and
+    # the saves) is skipped outright instead of scanning every position
+    # to discover there is nothing to do.
+    pending_exit_items = [
+        (ticker, details) for ticker, details in current_positions.items()
+        if details.status == 'pending_exit'
+    ]
+    if not pending_exit_items:
+        logger.log_action("Trading Bot (initial_exit_check): No pending_exit positions carried over; skipping exit-order sweep.")
+    else:
+        positions_after_exit_check = current_positions.copy() # Work on a copy
+        any_positions_changed_by_exit_check = False
+        exit_check_time = datetime.now() # One exit timestamp shared by every fill in this sweep
+        # Removals are staged here and applied after the loop, so the dict can
+        # be iterated directly without an O(N) items() snapshot. In-place field
+        # updates on a position are safe during iteration; only key removal
+        # would not be.
+        filled_exits_to_remove = [] # (ticker, fill_price, exit_reason, order_id)
+        # Status lookups for known exit orders are independent blocking HTTPS
+        # calls; resolve them concurrently up front so the loop below reads from
+        # a local map instead of paying one round trip per position.
+        known_exit_order_ids = [
+            details.pending_exit_order_id for _, details in pending_exit_items
+            if details.pending_exit_order_id
+        ]
+        exit_status_by_order_id = {}
+        if known_exit_order_ids:
+            with ThreadPoolExecutor(max_workers=min(8, len(known_exit_order_ids))) as status_executor:
+                status_results = status_executor.map(
+                    lambda oid: order_manager.get_order_status(oid, api_client=api), known_exit_order_ids
+                )
+                exit_status_by_order_id = dict(zip(known_exit_order_ids, status_results))
+        for ticker, details in pending_exit_items:
+            known_exit_order_id = details.pending_exit_order_id
             if known_exit_order_id:
-                logger.log_action(f"Trading Bot (initial_exit_check): Checking known pending exit order {known_exit_order_id} for {ticker}.")
-                order_status_obj = order_manager.get_order_status(known_exit_order_id, api_client=api)
+                logger.log_debug("Trading Bot (initial_exit_check): Checking known pending exit order %s for %s.", known_exit_order_id, ticker)
+                order_status_obj = exit_status_by_order_id.get(known_exit_order_id)
                 if order_status_obj:
                     if order_status_obj.status == 'filled':
                         try:
                             fill_price = float(order_status_obj.filled_avg_price)
                             # fill_qty = float(order_status_obj.filled_qty) # Qty from position details is authority
                             logger.log_action(f"Trading Bot (initial_exit_check): Known exit order {known_exit_order_id} for {ticker} FILLED. Price: ${fill_price}.")
-                            exit_reason = details.get('exit_reason_for_order', 'automated_exit_filled_at_startup')
-                            # Use remove_position which now takes positions dict
-                            positions_after_exit_check = position_manager.remove_position(positions_after_exit_check, ticker, fill_price, exit_reason, known_exit_order_id)
+                            exit_reason = details.exit_reason_for_order or 'automated_exit_filled_at_startup'
+                            # Stage the removal; applied after the loop.
+                            filled_exits_to_remove.append((ticker, fill_price, exit_reason, known_exit_order_id))
                             any_positions_changed_by_exit_check = True
                             # Also remove from current_pending_orders if it was there (shouldn't be if exit order)
                             if known_exit_order_id in current_pending_orders:
                                 del current_pending_orders[known_exit_order_id]
+                                pending_orders_dirty = True
                         except Exception as ex:
                             logger.log_action(f"Trading Bot (initial_exit_check): Error processing filled known exit order {known_exit_order_id} ({ticker}): {ex}")
-                    elif order_status_obj.status in ['canceled', 'expired', 'rejected', 'done_for_day']:
+                    elif order_status_obj.status in _TERMINAL_ORDER_STATUSES:
                         logger.log_action(f"Trading Bot (initial_exit_check): Known exit order {known_exit_order_id} for {ticker} is {order_status_obj.status}. Reverting position to 'open'.")
-                        positions_after_exit_check[ticker].update({'status': 'open', 'pending_exit_order_id': None, 'pending_exit_order_placed_at': None, 'exit_reason_for_order': None})
+                        details.status = 'open'
+                        position_manager.open_tickers.add(ticker)
+                        position_manager.mark_positions_dirty()
+                        details.pending_exit_order_id = None
+                        details.pending_exit_order_placed_at = None
+                        details.exit_reason_for_order = None
                         any_positions_changed_by_exit_check = True
                         if known_exit_order_id in current_pending_orders: # Should also be removed from pending
                              del current_pending_orders[known_exit_order_id]
+                             pending_orders_dirty = True
                     # else: status is still open-like, leave as 'pending_exit'
                 else: # Could not get status
                     logger.log_action(f"Trading Bot (initial_exit_check): Could not get status for known pending exit {known_exit_order_id} ({ticker}). Assuming inactive for now, reverting to 'open'.")
-                    positions_after_exit_check[ticker].update({'status': 'open', 'pending_exit_order_id': None, 'pending_exit_order_placed_at': None, 'exit_reason_for_order': None})
+                    details.status = 'open'
+                    position_manager.open_tickers.add(ticker)
+                    position_manager.mark_positions_dirty()
+                    details.pending_exit_order_id = None
+                    details.pending_exit_order_placed_at = None
+                    details.exit_reason_for_order = None
                     any_positions_changed_by_exit_check = True
                     if known_exit_order_id in current_pending_orders:
                         del current_pending_orders[known_exit_order_id]
+                        pending_orders_dirty = True
             else: # 'pending_exit' but no order_id (should be rare after sync)
                 logger.log_action(f"Trading Bot (initial_exit_check): Position {ticker} 'pending_exit' but no order_id. Checking Alpaca for open exit order.")
                 # This case should ideally be resolved by sync_positions_from_alpaca or earlier checks
                 # If still here, might revert to 'open' or try to find matching order
                 # For now, let check_and_manage_open_positions handle it if it persists.
 
-    current_positions = positions_after_exit_check # Update current_positions with results of this check
-    if any_positions_changed_by_exit_check:
-        position_manager.save_positions(current_positions) # Save if changes were made
-        save_pending_orders(current_pending_orders) # Save if changes were made
+        for ticker, fill_price, exit_reason, exit_order_id in filled_exits_to_remove:
+            positions_after_exit_check = position_manager.remove_position(positions_after_exit_check, ticker, fill_price, exit_reason, exit_order_id, as_of=exit_check_time)
+        if filled_exits_to_remove:
+            # remove_position buffers trade rows in logger's persistent CSV
+            # writer; flush here so Step-1 exits reach disk even if the run
+            # dies before the management cycle's own flush.
+            logger.flush_trades()
 
+        current_positions = positions_after_exit_check # Update current_positions with results of this check
+        position_manager.save_positions_if_dirty(current_positions)
+        if pending_orders_dirty:
+            save_pending_orders(current_pending_orders) # Save if changes were made
+            pending_orders_dirty = False
 
-    # --- Step 2: Fetch Market Data ---
-    logger.log_action("Step 2: Fetching market data (historical and latest prices)...")
-    historical_data_multi_df = data_fetcher.get_historical_data(
-        config.TICKERS, timeframe='1Day',
-        limit_per_ticker=config.Z_SCORE_WINDOW + 20, # Buffer for NaNs
-        api_client=api
-    )
-    latest_prices = data_fetcher.get_latest_prices(config.TICKERS, api_client=api)
+
+    # --- Step 2: Validate Market Data ---
+    logger.log_action("Step 2: Validating prefetched market data (historical and latest prices)...")
 
     if historical_data_multi_df.empty and not latest_prices:
         logger.log_action("CRITICAL: Failed to fetch market data. Bot exiting.")
-        logger.log_action(f"===== Bot session ended due to data error at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =====")
+        logger.log_action(f"===== Bot session ended due to data error at {datetime.now().isoformat(sep=' ', timespec='seconds')} =====")
         return
     if historical_data_multi_df.empty: logger.log_action("WARNING: Failed to fetch historical data.")
     if not latest_prices: logger.log_action("WARNING: Failed to fetch latest prices.")
 
     historical_data_map_for_pm = {} # Ticker -> DataFrame
     if not historical_data_multi_df.empty:
-        for ticker_sym in config.TICKERS:
-            try:
-                if ticker_sym in historical_data_multi_df.index.get_level_values('symbol'):
-                    historical_data_map_for_pm[ticker_sym] = historical_data_multi_df.xs(ticker_sym, level='symbol')
-                else:
-                    logger.log_action(f"No historical data for {ticker_sym} in multi-ticker DF.")
-            except KeyError:
-                 logger.log_action(f"KeyError accessing hist data for {ticker_sym}.")
+        try:
+            # One groupby traversal yields every per-ticker slice, instead of
+            # an O(N) MultiIndex cross-section scan per ticker. Sorting the
+            # index once up front keeps each group time-sorted and lets
+            # pandas use the monotonic fast path.
+            if not historical_data_multi_df.index.is_monotonic_increasing:
+                historical_data_multi_df = historical_data_multi_df.sort_index()
+            historical_data_map_for_pm = {
+                ticker_sym: group.droplevel('symbol')
+                for ticker_sym, group in historical_data_multi_df.groupby(level='symbol', sort=False)
+            }
+        except KeyError:
+            logger.log_action("KeyError splitting historical data by symbol level.")
+        missing_data_warnings = [
+            f"No historical data for {ticker_sym} in multi-ticker DF."
+            for ticker_sym in config.TICKERS if ticker_sym not in historical_data_map_for_pm
+        ]
+        logger.log_actions_batch(missing_data_warnings)
 
     # --- Step 3: Manage Open Positions (Check for Exits) ---
     logger.log_action("Step 3: Managing open positions for potential exits...")
     # Pass the authoritative `current_positions` and `alpaca_live_positions_map` (which is alpaca_open_positions_map)
     # Also pass `alpaca_open_orders_map_for_pm` for checking existing exit orders
-    positions_after_management = position_manager.check_and_manage_open_positions(
+    # check_and_manage_open_positions mutates `current_positions` in place
+    # and returns the same reference; persist the post-management state.
+    current_positions = position_manager.check_and_manage_open_positions(
         current_positions, # This is the synced and authoritative set of positions
         latest_prices,
         historical_data_map_for_pm,
@@ -259,38 +548,75 @@ def main():
         alpaca_open_orders_map_for_pm, # Map of open orders by ticker
         alpaca_live_positions_map      # Map of live Alpaca positions by ticker
     )
-    # If check_and_manage_open_positions modified the dictionary, it returned a new one.
-    # Update current_positions and save if it changed.
-    if id(positions_after_management) != id(current_positions) or positions_after_management != current_positions:
-        logger.log_action("Trading Bot: Positions dictionary updated by check_and_manage_open_positions. Saving.")
-        current_positions = positions_after_management
-        position_manager.save_positions(current_positions)
-    else:
-        logger.log_action("Trading Bot: No changes to positions dictionary from check_and_manage_open_positions.")
+    position_manager.save_positions_if_dirty(current_positions)
 
 
     # --- Step 4: Evaluate New Entry Signals ---
     logger.log_action("Step 4: Evaluating new entry signals...")
-    available_cash = position_manager.get_available_cash(api)
+    # Both reads come off the account snapshot fetched at initialization —
+    # no repeat get_account round trips. Exit orders placed earlier this run
+    # don't consume buying power for the entry sizing done here, and the
+    # planning loop below reserves cash per planned order anyway.
+    available_cash = position_manager.get_available_cash(api, account=account)
     logger.log_action(f"Available cash for new entries: ${available_cash:.2f}")
     pdt_count = 0
     try:
-        pdt_count = int(api.get_account().daytrade_count)
-        logger.log_action(f"PDT count from Alpaca API: {pdt_count}")
+        pdt_count = int(account.daytrade_count)
+        logger.log_action(f"PDT count from account snapshot: {pdt_count}")
     except Exception as e:
-        logger.log_action(f"Could not get PDT count from Alpaca API: {e}. Using CSV method.")
+        logger.log_action(f"Could not get PDT count from account snapshot: {e}. Using CSV method.")
         pdt_count = position_manager.get_pdt_trade_count() # This is a placeholder in position_manager
 
     # `current_pending_orders` is already up-to-date from initial sync.
     # `current_positions` is also up-to-date.
 
-    for ticker_symbol in config.TICKERS:
-        current_price = latest_prices.get(ticker_symbol)
-        if not isinstance(current_price, (int, float)) or current_price <= 0:
-            logger.log_action(f"Invalid/missing price for {ticker_symbol} ({current_price}); skipping entry.")
+    # Serial planning pass: all signal evaluation and the PDT/cash gating run
+    # single-threaded here (cash is reserved at planning time, same
+    # approximation as before). The blocking order placements are collected
+    # into a plan and fanned out concurrently below, so N entries cost ~one
+    # network round-trip instead of N sequential ones.
+    # When the PDT limit is already reached, every entry below would be
+    # refused anyway — skip the z-score batch and the whole evaluation loop.
+    tickers_to_eval = config.TICKERS
+    entry_z_scores = {}
+    if pdt_count >= 3:
+        logger.log_action(f"PDT limit ({pdt_count}) reached; skipping entry evaluation for all tickers.")
+        tickers_to_eval = []
+    else:
+        # All tickers' latest z-scores come from one vectorized batch instead
+        # of a per-ticker rolling computation inside the loop below.
+        entry_z_scores = _compute_entry_zscores_batch(historical_data_map_for_pm)
+
+    # Tickers blocked by an active position are resolved once here, so the
+    # loop below does a single set probe per ticker instead of a dict lookup
+    # plus a freshly built status list on every iteration.
+    blocking_statuses = frozenset({'open', 'pending_exit'})
+    position_blocked_tickers = {
+        ticker_sym for ticker_sym, details in current_positions.items()
+        if details.status in blocking_statuses
+    }
+
+    # Prices are normalized to float at the fetch boundary, so validity is
+    # one vectorized positive-and-finite mask over the whole price map
+    # instead of an isinstance probe and comparison per loop iteration.
+    price_values = np.fromiter(latest_prices.values(), dtype=np.float64, count=len(latest_prices))
+    price_valid_mask = (price_values > 0) & np.isfinite(price_values)
+    valid_latest_prices = {
+        ticker_sym: price for (ticker_sym, price), ok in zip(latest_prices.items(), price_valid_mask) if ok
+    }
+
+    # Per-ticker evaluation lines are buffered and written in one batch
+    # after the loop (one open+write for the whole universe instead of one
+    # per ticker); only critical errors keep the synchronous path.
+    eval_log = []
+    entry_candidates = []
+    for ticker_symbol in tickers_to_eval:
+        current_price = valid_latest_prices.get(ticker_symbol)
+        if current_price is None:
+            eval_log.append(f"Invalid/missing price for {ticker_symbol} ({latest_prices.get(ticker_symbol)}); skipping entry.")
             continue
-        if ticker_symbol in current_positions and current_positions[ticker_symbol].get('status') in ['open', 'pending_exit']:
-            logger.log_action(f"Trading Bot (new_entry_eval): Active or pending_exit position for {ticker_symbol}. Skipping new entry.")
+        if ticker_symbol in position_blocked_tickers:
+            eval_log.append(f"Trading Bot (new_entry_eval): Active or pending_exit position for {ticker_symbol}. Skipping new entry.")
             continue
 
         # Check against `alpaca_open_orders_map_for_pm` (which is up-to-date) instead of the older `alpaca_open_orders_map`
@@ -298,55 +624,68 @@ def main():
             # More specific check: is there an OPEN BUY/SELL order (not an exit for a short/long)
             # This check might be too broad if `alpaca_open_orders_map_for_pm` includes exit orders for other strategies.
             # For now, assume any open order for the ticker means no new entry.
-            logger.log_action(f"Trading Bot (new_entry_eval): Existing open Alpaca order(s) for {ticker_symbol} in alpaca_open_orders_map_for_pm. Skipping new entry.")
+            eval_log.append(f"Trading Bot (new_entry_eval): Existing open Alpaca order(s) for {ticker_symbol} in alpaca_open_orders_map_for_pm. Skipping new entry.")
             continue
 
-        ticker_hist_data_df = historical_data_map_for_pm.get(ticker_symbol)
-        if ticker_hist_data_df is None or ticker_hist_data_df.empty or 'close' not in ticker_hist_data_df.columns:
-            logger.log_action(f"Insufficient/invalid historical data for {ticker_symbol}. Skipping entry.")
+        current_z_score = entry_z_scores.get(ticker_symbol)
+        if current_z_score is None:
+            eval_log.append(f"Insufficient/invalid historical data for {ticker_symbol}. Skipping entry.")
             continue
-
-        z_scores = signal_generator.calculate_zscore(ticker_hist_data_df['close'])
-        if z_scores is None or z_scores.empty or pd.isna(z_scores.iloc[-1]):
-            logger.log_action(f"Z-score for {ticker_symbol} NaN or uncalculable. Skipping entry.")
+        if pd.isna(current_z_score):
+            eval_log.append(f"Z-score for {ticker_symbol} NaN or uncalculable. Skipping entry.")
             continue
-        current_z_score = z_scores.iloc[-1]
         signal = signal_generator.generate_signals(ticker_symbol, None, current_z_score=current_z_score)
-        logger.log_action(f"Eval New Entry: {ticker_symbol}, Price={current_price:.2f}, Z={current_z_score:.2f}, Signal={signal}")
+        eval_log.append(f"Eval New Entry: {ticker_symbol}, Price={current_price:.2f}, Z={current_z_score:.2f}, Signal={signal}")
 
         if signal in ["BUY", "SELL"]:
-            if pdt_count >= 3:
-                logger.log_action(f"PDT limit ({pdt_count}) reached. No new opening trade for {ticker_symbol}.")
-                continue
-            try:
-                qty = int(config.POSITION_SIZE_USD / current_price)
-            except ZeroDivisionError:
-                logger.log_action(f"Price for {ticker_symbol} is zero. Cannot calc qty.")
-                continue
-            if qty <= 0:
-                logger.log_action(f"Calculated qty <= 0 for {ticker_symbol}. Skipping.")
-                continue
-            if (qty * current_price) > available_cash:
-                logger.log_action(f"Insufficient cash for {ticker_symbol}. Need ${qty*current_price:.2f}, have ${available_cash:.2f}. Skipping.")
-                continue
-
-            order_side = 'buy' if signal == "BUY" else 'sell'
-            logger.log_action(f"Attempting {order_side} order: {qty} {ticker_symbol} @ limit ${current_price:.2f}")
-            entry_order = order_manager.place_limit_order(ticker_symbol, qty, current_price, order_side, api_client=api)
+            # pdt_count >= 3 short-circuits the whole loop above, so no
+            # per-ticker PDT check is needed here.
+            entry_candidates.append((ticker_symbol, current_price, signal, current_z_score))
+    logger.log_actions_batch(eval_log)
+
+    # Allocate scarce cash to the strongest signals first: candidates are
+    # planned in descending |z| rather than config.TICKERS order, so when
+    # cash runs out it is the weakest signals that get skipped.
+    entry_candidates.sort(key=lambda cand: abs(cand[3]), reverse=True)
+
+    entry_plans = []
+    for ticker_symbol, current_price, signal, current_z_score in entry_candidates:
+        # The price mask above guarantees current_price > 0, so the
+        # division cannot raise.
+        qty = int(config.POSITION_SIZE_USD / current_price)
+        if qty <= 0:
+            logger.log_action(f"Calculated qty <= 0 for {ticker_symbol}. Skipping.")
+            continue
+        if (qty * current_price) > available_cash:
+            logger.log_action(f"Insufficient cash for {ticker_symbol}. Need ${qty*current_price:.2f}, have ${available_cash:.2f}. Skipping.")
+            continue
 
+        order_side = 'buy' if signal == "BUY" else 'sell'
+        logger.log_action(f"Planned {order_side} order: {qty} {ticker_symbol} @ limit ${current_price:.2f}")
+        entry_plans.append((ticker_symbol, qty, current_price, order_side, signal, current_z_score))
+        available_cash -= (qty * current_price) # Reserve cash at planning time (approximate)
+
+    if entry_plans:
+        logger.log_action(f"Trading Bot: Submitting {len(entry_plans)} planned entry order(s) as one batch...")
+        batch_results = order_manager.place_limit_orders_batch(entry_plans, api_client=api)
+        for plan, entry_order in batch_results:
+            ticker_symbol, qty, current_price, order_side, signal, current_z_score = plan
             if entry_order and hasattr(entry_order, 'id'):
                 logger.log_action(f"Trading Bot: Entry order {entry_order.id} ({order_side} {qty} {ticker_symbol}) placed. Status: {entry_order.status}")
-                # Add to current_pending_orders immediately and save
-                current_pending_orders[entry_order.id] = {
-                    "ticker": ticker_symbol, "qty": qty, "side": order_side, "limit_price": current_price,
-                    "type": "entry_long" if signal == "BUY" else "entry_short",
-                    "placed_at": datetime.now().isoformat(), "z_at_placement": current_z_score,
-                    "status": entry_order.status # Initial status from Alpaca
-                }
-                save_pending_orders(current_pending_orders) # Save updated pending orders
-                available_cash -= (qty * current_price) # Decrement available cash (approximate)
+                record = _acquire_pending_record()
+                record.update(
+                    ticker=ticker_symbol, qty=qty, side=order_side, limit_price=current_price,
+                    type="entry_long" if signal == "BUY" else "entry_short",
+                    placed_at=datetime.now().isoformat(), z_at_placement=current_z_score,
+                    status=entry_order.status # Initial status from Alpaca
+                )
+                current_pending_orders[entry_order.id] = record
+                pending_orders_dirty = True
             else:
                 logger.log_action(f"Trading Bot: Failed to place entry order for {ticker_symbol}.")
+        if pending_orders_dirty:
+            save_pending_orders(current_pending_orders) # One save for the whole batch
+            pending_orders_dirty = False
 
     # --- Step 5: Final Reconciliation of Pending Orders and Positions ---
     logger.log_action("Step 5: Final reconciliation of all pending orders and resulting positions...")
@@ -356,9 +695,38 @@ def main():
     final_alpaca_live_open_orders_list = order_manager.get_open_orders(api_client=api)
     final_alpaca_live_open_orders_map_by_id = {order.id: order for order in final_alpaca_live_open_orders_list}
 
+    # Bulk-fetch closed orders once so pending orders that dropped off the
+    # open list resolve from a local map instead of one get_order_status
+    # round trip each. get_order_status remains the fallback for any order
+    # the bulk window missed.
+    closed_orders_map_by_id = {}
+    missing_order_ids = [oid for oid in current_pending_orders if oid not in final_alpaca_live_open_orders_map_by_id]
+    if missing_order_ids:
+        earliest_placed_at = min(
+            (current_pending_orders[oid].get('placed_at') for oid in missing_order_ids if current_pending_orders[oid].get('placed_at')),
+            default=None
+        )
+        closed_orders_list = order_manager.get_closed_orders(api_client=api, after=earliest_placed_at, limit=500)
+        closed_orders_map_by_id = {order.id: order for order in closed_orders_list}
+        logger.log_action(f"Trading Bot (final_recon): Bulk-fetched {len(closed_orders_map_by_id)} closed orders for {len(missing_order_ids)} missing pending order(s).")
+        # Any orders the bulk window missed are resolved concurrently here,
+        # so the reconciliation loop itself issues no REST calls at all.
+        fallback_order_ids = [oid for oid in missing_order_ids if oid not in closed_orders_map_by_id]
+        if fallback_order_ids:
+            with ThreadPoolExecutor(max_workers=min(8, len(fallback_order_ids))) as status_executor:
+                status_results = status_executor.map(
+                    lambda oid: order_manager.get_order_status(oid, api_client=api), fallback_order_ids
+                )
+                for oid, status_obj in zip(fallback_order_ids, status_results):
+                    if status_obj is not None:
+                        closed_orders_map_by_id[oid] = status_obj
+
     orders_to_remove_from_current_pending = []
 
-    for order_id, order_details in list(current_pending_orders.items()): # Iterate copy for safe modification
+    # Safe to iterate directly: removals are staged in
+    # orders_to_remove_from_current_pending and applied after the loop, and
+    # in-place status updates don't change the key set.
+    for order_id, order_details in current_pending_orders.items():
         ticker = order_details['ticker']
         order_type = order_details['type'] # e.g. "entry_long", "entry_short", "alpaca_sync_buy"
 
@@ -367,13 +735,14 @@ def main():
             if current_pending_orders[order_id]['status'] != alpaca_order_obj.status:
                 logger.log_action(f"Trading Bot (final_recon): Pending order {order_id} ({ticker}, {order_type}) status updated on Alpaca to '{alpaca_order_obj.status}'. Was '{current_pending_orders[order_id]['status']}'.")
                 current_pending_orders[order_id]['status'] = alpaca_order_obj.status
+                pending_orders_dirty = True
             # else: status is the same, no action needed other than keeping it in current_pending_orders
         else: # Not in Alpaca's latest open list; must be filled, cancelled, expired, etc.
-            logger.log_action(f"Trading Bot (final_recon): Pending order {order_id} ({ticker}, {order_type}) not in Alpaca's latest open orders. Checking final status...")
-            final_status_obj = order_manager.get_order_status(order_id, api_client=api)
+            logger.log_debug("Trading Bot (final_recon): Pending order %s (%s, %s) not in Alpaca's latest open orders. Checking final status...", order_id, ticker, order_type)
+            final_status_obj = closed_orders_map_by_id.get(order_id)
 
             if final_status_obj:
-                logger.log_action(f"Trading Bot (final_recon): Final status for order {order_id} ({ticker}) is '{final_status_obj.status}'.")
+                logger.log_debug("Trading Bot (final_recon): Final status for order %s (%s) is '%s'.", order_id, ticker, final_status_obj.status)
                 if final_status_obj.status == 'filled':
                     try:
                         fill_price = float(final_status_obj.filled_avg_price)
@@ -387,18 +756,14 @@ def main():
                         logger.log_action(f"Trading Bot (final_recon): Order {order_id} ({ticker}, {order_type}) FILLED. Qty: {fill_qty}, Price: ${fill_price:.2f}.")
 
                         # Determine position type based on original order intention
-                        pos_type_from_order = None
-                        if order_type.startswith('entry_long') or (order_type.startswith('alpaca_sync') and order_details['side'] == 'buy'):
-                            pos_type_from_order = 'long'
-                        elif order_type.startswith('entry_short') or (order_type.startswith('alpaca_sync') and order_details['side'] == 'sell'):
-                            pos_type_from_order = 'short'
+                        pos_type_from_order = _pos_type_for_order(order_type, order_details['side'])
 
                         if pos_type_from_order:
                             entry_fill_time = datetime.now() # Default
                             if hasattr(final_status_obj, 'filled_at') and final_status_obj.filled_at:
                                 try:
                                     filled_at_val = final_status_obj.filled_at
-                                    if isinstance(filled_at_val, str): entry_fill_time = pd.to_datetime(filled_at_val).to_pydatetime()
+                                    if isinstance(filled_at_val, str): entry_fill_time = _parse_iso(filled_at_val)
                                     elif isinstance(filled_at_val, datetime): entry_fill_time = filled_at_val
                                     elif hasattr(filled_at_val, 'isoformat'): entry_fill_time = datetime.fromisoformat(filled_at_val.isoformat())
                                 except Exception as e_ts:
@@ -414,12 +779,13 @@ def main():
                         orders_to_remove_from_current_pending.append(order_id)
                     except Exception as ex:
                         logger.log_action(f"Trading Bot (final_recon): Error processing filled order {order_id} ({ticker}, {order_type}): {ex}. Order details: {vars(final_status_obj)}")
-                elif final_status_obj.status in ['expired', 'canceled', 'rejected', 'done_for_day']:
+                elif final_status_obj.status in _TERMINAL_ORDER_STATUSES:
                     logger.log_action(f"Trading Bot (final_recon): Order {order_id} ({ticker}, {order_type}) is '{final_status_obj.status}'. Removing from pending list.")
                     orders_to_remove_from_current_pending.append(order_id)
                 else: # e.g. 'new', 'accepted', 'pending_cancel' - should ideally not happen if not in open list, but log
                     logger.log_action(f"Trading Bot (final_recon): Order {order_id} ({ticker}, {order_type}) has status '{final_status_obj.status}' but was not in open list. Keeping in pending for now.")
                     current_pending_orders[order_id]['status'] = final_status_obj.status # Update status
+                    pending_orders_dirty = True
             else: # Could not get status from Alpaca for an order not in the open list
                 logger.log_action(f"Trading Bot (final_recon): Could not get final status for pending order {order_id} ({ticker}, {order_type}). Assuming inactive, removing from pending list.")
                 orders_to_remove_from_current_pending.append(order_id)
@@ -427,15 +793,19 @@ def main():
     # Process removals from current_pending_orders
     if orders_to_remove_from_current_pending:
         for oid in orders_to_remove_from_current_pending:
-            if oid in current_pending_orders:
-                del current_pending_orders[oid]
+            record = current_pending_orders.pop(oid, None)
+            if record is not None:
+                _release_pending_record(record)
+                pending_orders_dirty = True
         logger.log_action(f"Trading Bot (final_recon): Removed {len(orders_to_remove_from_current_pending)} orders from active pending list.")
 
-    # Save the final state of pending orders and positions for this run
-    save_pending_orders(current_pending_orders)
-    save_run_pending_orders_snapshot(current_pending_orders) # Snapshot for this run
-    if any_new_entries_filled_this_cycle: # Also save positions if new ones were added
-        position_manager.save_positions(current_positions)
+    # Save the final state of pending orders and positions for this run;
+    # skipped entirely when no pending order changed since the last save.
+    if pending_orders_dirty:
+        save_pending_orders(current_pending_orders)
+        save_run_pending_orders_snapshot(current_pending_orders) # Snapshot for this run
+        pending_orders_dirty = False
+    position_manager.save_positions_if_dirty(current_positions) # Covers any new fills
 
 
     # Optional: Clean up the main PENDING_ORDERS_FILE if snapshotting is the primary goal for historicals
@@ -447,7 +817,12 @@ def main():
     #     except OSError as e:
     #         logger.log_action(f"Error related to {config.PENDING_ORDERS_FILE}: {e}")
 
-    if any_new_entries_filled_this_cycle:
+    if any_new_entries_filled_this_cycle and time.monotonic() - market_data_fetched_at <= MARKET_DATA_FRESHNESS_SECONDS:
+        # The rerun would consume the same price/z-score snapshot the main
+        # management pass just evaluated, so it cannot reach different exit
+        # decisions — skip it and save the extra API round trips.
+        logger.log_action("Trading Bot: New positions were opened, but market data is still fresh; skipping redundant management pass.")
+    elif any_new_entries_filled_this_cycle:
         logger.log_action("Trading Bot: New positions were opened. Re-running position management for immediate exit checks on these new positions...")
         # Re-fetch latest prices if there could have been a significant delay
         # latest_prices_for_final_check = data_fetcher.get_latest_prices(config.TICKERS, api_client=api)
@@ -455,14 +830,14 @@ def main():
 
         # Re-fetch open orders map as well, as new exits might have been placed by other logic if run concurrently (unlikely here)
         final_alpaca_open_orders_list_for_pm_rerun = order_manager.get_open_orders(api_client=api, tickers=config.TICKERS)
-        final_alpaca_open_orders_map_for_pm_rerun = {order.symbol: [] for order in final_alpaca_open_orders_list_for_pm_rerun}
+        final_alpaca_open_orders_map_for_pm_rerun = defaultdict(list)
         for order in final_alpaca_open_orders_list_for_pm_rerun:
             final_alpaca_open_orders_map_for_pm_rerun[order.symbol].append(order)
 
         # Re-fetch live positions map
         final_alpaca_live_positions_map_rerun = data_fetcher.get_alpaca_open_positions(api_client=api)
 
-        positions_after_final_mgmt = position_manager.check_and_manage_open_positions(
+        current_positions = position_manager.check_and_manage_open_positions(
             current_positions, # Pass the latest `current_positions` which includes newly added ones
             latest_prices, # Or latest_prices_for_final_check
             historical_data_map_for_pm,
@@ -470,12 +845,9 @@ def main():
             final_alpaca_open_orders_map_for_pm_rerun,
             final_alpaca_live_positions_map_rerun
         )
-        if id(positions_after_final_mgmt) != id(current_positions) or positions_after_final_mgmt != current_positions:
-            logger.log_action("Trading Bot: Positions dictionary updated by final post-fill management. Saving.")
-            current_positions = positions_after_final_mgmt
-            position_manager.save_positions(current_positions)
+        position_manager.save_positions_if_dirty(current_positions)
 
-    logger.log_action(f"===== Trading Bot session finished at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} =====\n")
+    logger.log_action(f"===== Trading Bot session finished at {datetime.now().isoformat(sep=' ', timespec='seconds')} =====\n")
 
 if __name__ == "__main__":
     # Script designed for single daily execution. Scheduling is external.